@@ -0,0 +1 @@
+# Benchmarks for commish: synthetic league generation and timing of the main build stages.
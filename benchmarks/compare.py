@@ -0,0 +1,49 @@
+import json
+import argparse
+
+
+def compare(baseline, candidate):
+    """Compare the fastest time of each benchmark in two result files.
+
+    Returns
+    -------
+    list of tuple
+        The name, baseline time, candidate time and ratio (candidate / baseline) of every benchmark in both files.
+    """
+    rows = []
+    for name, timing in candidate["results"].items():
+        if name in baseline["results"]:
+            old = baseline["results"][name]["min"]
+            new = timing["min"]
+            rows.append((name, old, new, new / old if old > 0 else float("inf")))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare two benchmark result files written by benchmarks.run."
+    )
+    parser.add_argument("baseline", type=str, help="Results from the old commit.")
+    parser.add_argument("candidate", type=str, help="Results from the new commit.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="Flag benchmarks that are at least this many times slower.",
+    )
+    args = parser.parse_args()
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    with open(args.candidate, "r") as f:
+        candidate = json.load(f)
+    if baseline["parameters"] != candidate["parameters"]:
+        print("Warning: the two runs used different parameters")
+
+    rows = compare(baseline, candidate)
+    width = max(len(row[0]) for row in rows)
+    for name, old, new, ratio in rows:
+        flag = "  SLOWER" if ratio >= args.threshold else ""
+        print(
+            f"{name:<{width}}  {old * 1000:10.2f} ms  {new * 1000:10.2f} ms  {ratio:6.2f}x{flag}"
+        )
@@ -0,0 +1,160 @@
+import os
+import json
+import argparse
+import numpy as np
+import yaml
+
+# Every performance field in schemas/episode.json, in the same order
+PERFORMANCE_FIELDS = [
+    "tops",
+    "win_main_challenge",
+    "bottoms",
+    "lip_sync_for_your_life",
+    "lip_sync_winner",
+    "win_mini_challenge",
+    "double_sashay",
+    "double_shantay",
+    "runway_malfunction",
+    "wig_reveal",
+    "lip_sync_malfunction",
+    "miss_congeniality",
+    "wins_lip_sync_smackdown",
+    "receive_mvq_vote",
+    "wild_card",
+]
+
+
+def _make_episode(episode, queens, remaining, finale, rng):
+    """Make the data for one episode. `remaining` is updated in place."""
+    performance = {
+        k: False if k in ["double_sashay", "double_shantay"] else []
+        for k in PERFORMANCE_FIELDS
+    }
+    data = {
+        "episode": episode,
+        "finale": finale,
+        "queen_eliminated": [],
+        "returning_queen": [],
+        "performance": performance,
+        "finale_data": {"winner": [], "runners_up": []},
+    }
+
+    order = [queens[i] for i in rng.permutation(remaining)]
+    if finale:
+        data["finale_data"]["winner"] = [order[0]]
+        data["finale_data"]["runners_up"] = [order[1]]
+        data["queen_eliminated"] = order[2:]
+        performance["miss_congeniality"] = [queens[rng.integers(len(queens))]]
+        remaining.clear()
+        return data
+
+    n_critiqued = min(3, len(order) // 2)
+    performance["tops"] = order[:n_critiqued]
+    performance["win_main_challenge"] = order[:1]
+    performance["win_mini_challenge"] = [order[rng.integers(len(order))]]
+    if n_critiqued > 0:
+        performance["bottoms"] = order[-n_critiqued:]
+
+    # Keep at least three queens for the finale
+    if len(remaining) > 3 and n_critiqued >= 2:
+        bottom_two = order[-2:]
+        performance["lip_sync_for_your_life"] = bottom_two
+        performance["lip_sync_winner"] = bottom_two[:1]
+        data["queen_eliminated"] = bottom_two[1:]
+        remaining.remove(queens.index(bottom_two[1]))
+    return data
+
+
+def generate_season(
+    output_dir,
+    n_queens=14,
+    n_contestants=1000,
+    n_episodes=14,
+    seed=0,
+    rank_scores="assets/rules/rank_values/final_three.tsv",
+    event_scores="assets/rules/event_scores/large.tsv",
+):
+    """Write a synthetic season in the same formats as the real ones.
+
+    Writes `queens.txt`, `contestants.tsv`, `episodes/NN.json` following `schemas/episode.json`, and a `season.yml` config following `schemas/season-config.yml` to `output_dir`. One queen is eliminated per episode until three are left, and the last episode is the finale.
+
+    Parameters
+    ----------
+    output_dir : str
+        The directory to write the season to.
+    n_queens : int, optional
+        The number of queens in the cast.
+    n_contestants : int, optional
+        The number of contestants in the league.
+    n_episodes : int, optional
+        The number of episodes, including the finale.
+    seed : int, optional
+        Seed for the random number generator.
+    rank_scores : str, optional
+        Path to the rank values rules file used in the config.
+    event_scores : str, optional
+        Path to the event scores rules file used in the config.
+
+    Returns
+    -------
+    str
+        The path to the season config.
+    """
+    assert n_queens >= 3, "A season needs at least three queens"
+    rng = np.random.default_rng(seed)
+    episodes_dir = os.path.join(output_dir, "episodes")
+    os.makedirs(episodes_dir, exist_ok=True)
+
+    queens = [f"Queen {i:03d}" for i in range(1, n_queens + 1)]
+    queens_file = os.path.join(output_dir, "queens.txt")
+    with open(queens_file, "w") as f:
+        f.write("\n".join(queens) + "\n")
+
+    contestants_file = os.path.join(output_dir, "contestants.tsv")
+    with open(contestants_file, "w") as f:
+        header = ["name", "captain"] + [str(i) for i in range(2, n_queens + 1)]
+        f.write("\t".join(header) + "\n")
+        for i in range(1, n_contestants + 1):
+            ranking = [queens[j] for j in rng.permutation(n_queens)]
+            f.write("\t".join([f"Contestant {i:06d}"] + ranking) + "\n")
+
+    remaining = list(range(n_queens))
+    for episode in range(1, n_episodes + 1):
+        data = _make_episode(
+            episode, queens, remaining, finale=episode == n_episodes, rng=rng
+        )
+        with open(os.path.join(episodes_dir, f"{episode:02d}.json"), "w") as f:
+            json.dump(data, f, indent=4)
+
+    season_config = {
+        "season": "benchmark",
+        "queens": queens_file,
+        "contestants": contestants_file,
+        "rank_scores": rank_scores,
+        "event_scores": event_scores,
+        "episodes_dir": episodes_dir,
+        "intro_text": "A synthetic season for benchmarking.",
+    }
+    config_file = os.path.join(output_dir, "season.yml")
+    with open(config_file, "w") as f:
+        yaml.safe_dump(season_config, f, sort_keys=False)
+    return config_file
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic season.")
+    parser.add_argument("output_dir", type=str, help="Directory to write to.")
+    parser.add_argument("--queens", type=int, default=14)
+    parser.add_argument("--contestants", type=int, default=1000)
+    parser.add_argument("--episodes", type=int, default=14)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(
+        generate_season(
+            args.output_dir,
+            n_queens=args.queens,
+            n_contestants=args.contestants,
+            n_episodes=args.episodes,
+            seed=args.seed,
+        )
+    )
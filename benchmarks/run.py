@@ -0,0 +1,216 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from glob import glob
+import numpy as np
+import pandas as pd
+import yaml
+import matplotlib
+
+matplotlib.use("Agg")
+
+from commish import __version__
+from commish.league import League
+from commish import plotting
+from .generate import generate_season
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The plotting functions that are timed and the keyword arguments for each, matching the defaults used by `make_plots`
+PLOT_FUNCTIONS = {
+    "plot_total_scores": {},
+    "plot_total_scores_split": {"colors": [None, None]},
+    "plot_weekly_scores": {},
+    "plot_rank_scores": {},
+    "plot_performance_scores": {},
+}
+
+
+def time_call(func, repeat=5):
+    """Call `func` `repeat` times and summarize how long each call took, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": float(np.median(times)), "repeat": repeat}
+
+
+def load_league(season_config):
+    """Create the league for a generated season without adding any episodes."""
+    return League(
+        season=season_config["season"],
+        queens_file=season_config["queens"],
+        contestant_file=season_config["contestants"],
+        rank_score_file=season_config["rank_scores"],
+        event_scores_file=season_config["event_scores"],
+    )
+
+
+def get_commit():
+    """Get the hash of the commit being benchmarked, or None if this is not a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(season_config_file, repeat=5):
+    """Time each stage of building a league for the season.
+
+    Parameters
+    ----------
+    season_config_file : str
+        Path to the season config, as written by `generate_season`.
+    repeat : int, optional
+        How many times to run each benchmark.
+
+    Returns
+    -------
+    dict
+        Maps the name of each benchmark to its timings.
+    """
+    with open(season_config_file, "r") as f:
+        season_config = yaml.safe_load(f)
+    episodes = sorted(glob(os.path.join(season_config["episodes_dir"], "*.json")))
+    results = {}
+
+    results["League.__init__"] = time_call(
+        lambda: load_league(season_config), repeat=repeat
+    )
+
+    # Adding episodes changes the league, so each repeat starts from a fresh one
+    add_times = []
+    for _ in range(repeat):
+        league = load_league(season_config)
+        start = time.perf_counter()
+        for episode_file in episodes:
+            league.add_episode(episode_file)
+        add_times.append((time.perf_counter() - start) / len(episodes))
+    results["League.add_episode"] = {
+        "min": min(add_times),
+        "median": float(np.median(add_times)),
+        "repeat": repeat,
+    }
+
+    batch_times = []
+    for _ in range(repeat):
+        batch_league = load_league(season_config)
+        start = time.perf_counter()
+        batch_league.add_episodes(episodes)
+        batch_times.append((time.perf_counter() - start) / len(episodes))
+    results["League.add_episodes"] = {
+        "min": min(batch_times),
+        "median": float(np.median(batch_times)),
+        "repeat": repeat,
+    }
+
+    for method in ["total_scores", "get_weekly_scores", "get_rank_scores"]:
+        results[f"League.{method}"] = time_call(getattr(league, method), repeat=repeat)
+
+    # Drawn on the figure pool, the same way the build draws them
+    with plotting.use_figure_pool():
+        for name, kwargs in PLOT_FUNCTIONS.items():
+            func = getattr(plotting, name)
+            results[f"plotting.{name}"] = time_call(
+                lambda func=func, kwargs=kwargs: plotting.release_figure(
+                    func(league, **kwargs)
+                ),
+                repeat=repeat,
+            )
+
+    # The full build runs in a new process, so it includes the start up and import time
+    with tempfile.TemporaryDirectory() as output_dir:
+        env = dict(os.environ, PYTHONPATH=REPO_DIR, MPLBACKEND="Agg")
+        command = [
+            sys.executable,
+            os.path.join("bin", "create_league.py"),
+            "--season-config",
+            os.path.abspath(season_config_file),
+            "--output_dir",
+            output_dir,
+        ]
+        results["create_league.py"] = time_call(
+            lambda: subprocess.run(
+                command,
+                cwd=REPO_DIR,
+                env=env,
+                check=True,
+                stdout=subprocess.DEVNULL,
+            ),
+            repeat=max(1, repeat // 2),
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark building a league on a synthetic season."
+    )
+    parser.add_argument("--queens", type=int, default=14)
+    parser.add_argument("--contestants", type=int, default=1000)
+    parser.add_argument("--episodes", type=int, default=14)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="How many times to run each benchmark."
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="benchmark-results.json",
+        help="Path to write the JSON results to.",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as season_dir:
+        season_config_file = generate_season(
+            season_dir,
+            n_queens=args.queens,
+            n_contestants=args.contestants,
+            n_episodes=args.episodes,
+            seed=args.seed,
+            rank_scores=os.path.join(
+                REPO_DIR, "assets/rules/rank_values/final_three.tsv"
+            ),
+            event_scores=os.path.join(REPO_DIR, "assets/rules/event_scores/large.tsv"),
+        )
+        results = run_benchmarks(season_config_file, repeat=args.repeat)
+
+    report = {
+        "commit": get_commit(),
+        "commish_version": __version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__,
+        "parameters": {
+            "queens": args.queens,
+            "contestants": args.contestants,
+            "episodes": args.episodes,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=4)
+
+    width = max(len(name) for name in results)
+    for name, timing in results.items():
+        print(f"{name:<{width}}  {timing['min'] * 1000:10.2f} ms")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
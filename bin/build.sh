@@ -12,7 +12,5 @@ rm -rf "${PUBLISH_DIR}"
 cp -r site-template "${PUBLISH_DIR}"
 
 CONFIG_DIR="season-configs"
-for config_file in "${CONFIG_DIR}"/*.yml; do
-  echo "Building league for config: ${config_file}"
-  python3 bin/create_league.py --season-config "${config_file}" --output_dir "${PUBLISH_DIR}"
-done
\ No newline at end of file
+echo "Building leagues for configs in: ${CONFIG_DIR}"
+python3 bin/build_site.py --config_dir "${CONFIG_DIR}" --output_dir "${PUBLISH_DIR}" --snapshot_dir .snapshots --cache_dir .build-cache --history_file .history.sqlite
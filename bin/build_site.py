@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+import os
+import argparse
+import time
+import yaml
+from glob import glob
+
+from commish.build import build_seasons
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build the leagues for every season config in parallel."
+    )
+    parser.add_argument(
+        "--config_dir",
+        type=str,
+        help="Directory containing the season config YAML files.",
+        default="season-configs",
+    )
+    parser.add_argument(
+        "--output_dir",
+        type=str,
+        help="Base directory for files to be output. Things will go to <output_dir>/seasons/<season>",
+        default="site-build",
+    )
+    parser.add_argument(
+        "--snapshot_dir",
+        type=str,
+        help="Directory for league snapshots. If set, each league resumes from <snapshot_dir>/<season>.npz and only adds new episodes.",
+        default=None,
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        help="Directory for the build cache. Seasons whose inputs have not changed are copied from the cache instead of being built.",
+        default=None,
+    )
+    parser.add_argument(
+        "--history_file",
+        type=str,
+        help="SQLite file to record every season's scores in, for all-time leaderboards. See `commish leaderboard`.",
+        default=None,
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Number of seasons to build at once. Default is one per CPU.",
+        default=None,
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check the running scores against a full recompute after every episode.",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    season_configs = []
+    for config_file in sorted(glob(os.path.join(args.config_dir, "*.yml"))):
+        with open(config_file, "r") as f:
+            season_configs.append(yaml.safe_load(f))
+
+    timings = build_seasons(
+        season_configs,
+        output_dir=args.output_dir,
+        snapshot_dir=args.snapshot_dir,
+        verify=args.verify,
+        jobs=args.jobs,
+        cache_dir=args.cache_dir,
+        history_file=args.history_file,
+    )
+
+    print("\nSeason build times:")
+    for season, seconds in timings.items():
+        print(f"  {str(season):<10} {seconds:6.2f}s")
+    print(f"  {'total':<10} {time.perf_counter() - start:6.2f}s")
@@ -1,13 +1,10 @@
 #!/usr/bin/env python3
-import os
 import argparse
 import yaml
-from glob import glob
-import pandas as pd
-from jinja2 import Environment, FileSystemLoader
 
-from commish.league import League
-from commish import plotting
+from commish.build import build_season
+from commish import profiling
+from commish.watch import SeasonWatcher
 
 
 parser = argparse.ArgumentParser(description="Create and analyze a fantasy league.")
@@ -15,177 +12,84 @@ parser.add_argument(
     "--season-config", type=str, help="Path to season config YAML file.", required=True
 )
 parser.add_argument("--debug", action="store_true", help="Enable debug mode.")
+parser.add_argument(
+    "--verify",
+    action="store_true",
+    help="Check the running scores against a full recompute after every episode.",
+)
 parser.add_argument(
     "--output_dir",
     type=str,
     help="Base directory for files to be output. Things will go to <output_dir>/seasons/<season>",
     default="site-build",
 )
-args = parser.parse_args()
-debug = args.debug
-output_dir = args.output_dir
-
-with open(args.season_config, "r") as f:
-    season_config = yaml.safe_load(f)
-
-season = season_config["season"]
-page_dir = os.path.join(output_dir, "seasons", str(season))
-os.makedirs(page_dir, exist_ok=True)
-
-team_size = season_config.get("team_size", 3)
-league = League(
-    season=season,
-    queens_file=season_config["queens"],
-    contestant_file=season_config["contestants"],
-    rank_score_file=season_config["rank_scores"],
-    event_scores_file=season_config["event_scores"],
-    captain_multiplier=season_config.get("captain_multiplier", 2),
-    team_size=team_size,
+parser.add_argument(
+    "--snapshot_dir",
+    type=str,
+    help="Directory for league snapshots. If set, the league resumes from <snapshot_dir>/<season>.npz and only adds new episodes.",
+    default=None,
 )
-
-# Add episodes
-episodes = sorted(glob(os.path.join(season_config["episodes_dir"], "*.json")))
-for episode_file in episodes:
-    league.add_episode(episode_file)
-
-# Set up the scoreboard page
-env = Environment(loader=FileSystemLoader("templates"), autoescape=False)
-if "scoreboard_template" in season_config:
-    template_file = season_config["scoreboard_template"]
-else:
-    template_file = "season.md.j2"
-
-scoreboard_template = env.get_template(template_file)
-has_started = league.episode_number > 0
-sections = {
-    "scoring": has_started,
-}
-
-# Main scoreboard page
-event_scores = league.rules.get_event_scores()
-event_scores = event_scores.rename_axis("Event", axis="index").rename("Point Value")
-event_scores = event_scores.rename(lambda x: x.replace("_", " ").title())
-
-rank_scores = league.rules.get_rank_scores()
-rank_scores = rank_scores.rename(
-    columns={
-        "team_score": "Worth of the Team",
-        "queen_score": "Worth of the Queen",
-    }
-).rename_axis("Rank", axis="index")
-
-if "intro_text" not in season_config:
-    season_config["intro_text"] = ""
-
-context = {
-    "season": season,
-    "sections": sections,
-    "queen_names": league.cast.get_queens().index.sort_values().tolist(),
-    "has_eliminations": league.cast.num_remaining_queens()
-    < len(league.cast.get_queens()),
-    "finished": league.cast.num_remaining_queens() == 0,
-    "performance_rules": event_scores.to_markdown(),
-    "rank_rules": rank_scores.to_markdown(),
-    "captain_multiplier": league.rules.get_captain_multiplier(),
-    "intro_text": season_config["intro_text"],
-}
-
-rankings = league.contestants.get_queen_rankings()
-if len(rankings) == 0:
-    sections["teams"] = False
-else:
-    sections["teams"] = True
-    rankings = (
-        pd.concat(rankings.values, keys=rankings.index)
-        .reset_index(level="name")
-        .reset_index(drop=True)
-    )
-    teams_table = rankings.pivot(index="rank", columns="name", values="queen")
-    teams_table = teams_table.rename_axis("Rank", axis="index").rename_axis(
-        "", axis="columns"
+parser.add_argument(
+    "--history_file",
+    type=str,
+    help="SQLite file to record the season's scores in, for all-time leaderboards.",
+    default=None,
+)
+parser.add_argument(
+    "--watch",
+    action="store_true",
+    help="Keep running and update the page whenever the season config, its input files, an episode or a template changes.",
+)
+parser.add_argument(
+    "--watch_interval",
+    type=float,
+    help="How often to check for changes in watch mode, in seconds.",
+    default=1.0,
+)
+parser.add_argument(
+    "--profile",
+    type=str,
+    nargs="?",
+    const="profile.json",
+    default=None,
+    help="Time each stage of the build and write the report to this JSON file (profile.json if no file is given). Plots are drawn in this process so they are included.",
+)
+args = parser.parse_args()
+if args.watch and args.profile is not None:
+    parser.error(
+        "--profile can't be used with --watch, since the report is only written when the build finishes"
     )
-    if team_size == 3:
-        reindex = {
-            1: "Winner (Captain)",
-            2: "Runner-up (Teammate)",
-            3: "3rd (Teammate)",
-        }
-    elif team_size == 2:
-        reindex = {1: "Winner (Captain)", 2: "Runner-up (Teammate)"}
-    else:
-        reindex = {i: f"{i}th" for i in teams_table.index}
-    teams_table = teams_table.rename(index=reindex)
-    context["teams_table"] = teams_table.to_markdown()
 
-# Scoring info
-if has_started:
-    scoring_context = {}
-    scores = league.total_scores().sort_values("total_score", ascending=False)
-    scores = scores.T.rename(
-        index={
-            "total_performance_score": "Performance Score",
-            "total_rank_score": "Rank Score",
-            "total_score": "Total Score",
-        }
-    ).rename_axis("", axis="columns")
-    scoring_context["scores_table"] = scores.to_markdown()
-
-    # The plots need to be in the same directory as the page for the website to build properly
-    plots_dir = os.path.join(page_dir, "plots")
-    os.makedirs(page_dir, exist_ok=True)
-    os.makedirs(plots_dir, exist_ok=True)
-
-    # Plots
-    performance_plot_kwargs = {}
-    if "performance_cmap" in season_config:
-        performance_plot_kwargs["cmap"] = season_config["performance_cmap"]
-
-    rank_scores_kwargs = {}
-    if "rank_scores_cmap" in season_config:
-        rank_scores_kwargs["cmap"] = season_config["rank_scores_cmap"]
-    if "invert_rank_annotation" in season_config:
-        rank_scores_kwargs["low_is_light"] = not season_config["invert_rank_annotation"]
-
-    bar_color = season_config["bar_color"] if "bar_color" in season_config else None
-    second_color = (
-        season_config["second_bar_color"]
-        if "second_bar_color" in season_config
-        else None
+if args.watch:
+    watcher = SeasonWatcher(
+        args.season_config,
+        output_dir=args.output_dir,
+        snapshot_dir=args.snapshot_dir,
+        verify=args.verify,
+        history_file=args.history_file,
+    )
+    try:
+        watcher.watch(interval=args.watch_interval)
+    except KeyboardInterrupt:
+        pass
+else:
+    with open(args.season_config, "r") as f:
+        season_config = yaml.safe_load(f)
+
+    if args.profile is not None:
+        profiling.enable()
+
+    build_season(
+        season_config,
+        output_dir=args.output_dir,
+        snapshot_dir=args.snapshot_dir,
+        verify=args.verify,
+        history_file=args.history_file,
+        plot_jobs=1 if args.profile is not None else None,
     )
 
-    performance_plot_kwargs["bar_color"] = bar_color
-
-    plot_functions = [
-        (lambda x: plotting.plot_total_scores(x, color=bar_color), "total_scores.png"),
-        (
-            lambda x: plotting.plot_total_scores_split(
-                x, colors=[bar_color, second_color]
-            ),
-            "stacked_total_scores.png",
-        ),
-        (
-            lambda x: plotting.plot_weekly_scores(x, **performance_plot_kwargs),
-            "weekly_scores.png",
-        ),
-        (
-            lambda x: plotting.plot_rank_scores(x, **rank_scores_kwargs),
-            "rank_scores.png",
-        ),
-        (
-            lambda x: plotting.plot_performance_scores(x, **performance_plot_kwargs),
-            "weekly_performance_scores.png",
-        ),
-    ]
-
-    for plot_func, filename in plot_functions:
-        fig = plot_func(league)
-        fig.savefig(os.path.join(plots_dir, filename))
-        scoring_context_key = filename.replace(".png", "_plot")
-        # Now when we make the page, the path needs to be relative to the page directory
-        scoring_context[scoring_context_key] = os.path.join("plots", filename)
-
-    context["scoring"] = scoring_context
-
-# Render the page
-with open(os.path.join(page_dir, "index.md"), "w") as f:
-    f.write(scoreboard_template.render(**context))
+    if args.profile is not None:
+        report = profiling.write_report(args.profile)
+        profiling.disable()
+        print(profiling.format_report(report))
+        print(f"Profile written to {args.profile}")
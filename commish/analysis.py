@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+
+from .simulation import get_team_values
+
+
+def _best_finish(values, rank_values):
+    """The highest total of `values @ rank_values[ranks]` for each row of `values`, over every way the queens still competing can finish, including ties.
+
+    The queens finish in groups of consecutive places: the winner alone in first, the runners-up together in second and the queens eliminated together in the same episode at the highest place of their group, e.g. two queens going home with ten left both finish ninth. For a given grouping the best total pairs the largest values with the best places, because the rank values never go up with rank. So the queens are taken from the largest value down, and the best grouping of the first `i` of them is found from the best groupings of fewer queens.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        A rows x queens matrix with one column for every queen still competing.
+    rank_values : np.ndarray
+        The value of each rank, indexed by rank, with at least one more entry than there are queens still competing.
+
+    Returns
+    -------
+    np.ndarray
+        The best total for each row.
+    """
+    n_rows, n_queens = values.shape
+    if n_queens == 0:
+        return np.zeros(n_rows, dtype=values.dtype)
+    totals = np.zeros((n_rows, n_queens + 1), dtype=values.dtype)
+    totals[:, 1:] = np.cumsum(-np.sort(-values, axis=1), axis=1)
+
+    # best[i] is the best total for the first i queens, with the last group ending at place i. The winner is always alone in first.
+    best = [np.zeros(n_rows, dtype=values.dtype), rank_values[1] * totals[:, 1]]
+    for i in range(2, n_queens + 1):
+        best_i = best[1] + rank_values[2] * (totals[:, i] - totals[:, 1])
+        for j in range(2, i):
+            np.maximum(
+                best_i,
+                best[j] + rank_values[j + 1] * (totals[:, i] - totals[:, j]),
+                out=best_i,
+            )
+        best.append(best_i)
+    return best[n_queens]
+
+
+# How often each performance event can be given out in a regular episode, where only the queens still competing take part, as (most times one queen gets it, most times in total). See `_best_award`.
+EVENT_LIMITS = {
+    "tops": (1, None),
+    # The bundled seasons have episodes with two main challenge winners
+    "win_main_challenge": (1, 2),
+    "bottoms": (1, None),
+    "lip_sync_for_your_life": (1, 2),
+    "lip_sync_winner": (1, 2),
+    "win_mini_challenge": (1, None),
+    "double_sashay": (1, 2),
+    "double_shantay": (1, 2),
+    "runway_malfunction": (1, None),
+    "wig_reveal": (1, None),
+    "lip_sync_malfunction": (1, None),
+    "miss_congeniality": (0, 0),
+    "wins_lip_sync_smackdown": (0, 0),
+}
+
+# The episodes that happen once a season where eliminated queens can score too, with the event that shows the episode has aired and the limits on each event in it. Events not listed in `EVENT_LIMITS` can also be given out in the finale.
+SPECIAL_EPISODES = {
+    # A queen can win up to four rounds of the Lip Sync Smackdown
+    "lip_sync_smackdown": (
+        "wins_lip_sync_smackdown",
+        {
+            "lip_sync_winner": (4, None),
+            "wig_reveal": (4, None),
+            "lip_sync_malfunction": (4, None),
+            "wins_lip_sync_smackdown": (1, 1),
+        },
+    ),
+    "finale": (
+        "miss_congeniality",
+        {
+            "miss_congeniality": (1, 1),
+            "runway_malfunction": (1, None),
+            "wig_reveal": (1, None),
+        },
+    ),
+}
+
+
+def _sort_weights(weights):
+    """Sort each row of `weights` from largest to smallest, once for events worth points and once for events costing points, with weights that would lose the row points set to 0. Returns the sorted weights and their running totals, with a column of zeros in front, for each sign."""
+    largest_first = -np.sort(-weights, axis=1)
+    sorted_weights = {}
+    for sign, ordered in [(1, largest_first), (-1, -largest_first[:, ::-1])]:
+        ordered = np.maximum(ordered, 0)
+        totals = np.zeros((len(weights), ordered.shape[1] + 1), dtype=weights.dtype)
+        np.cumsum(ordered, axis=1, out=totals[:, 1:])
+        sorted_weights[sign] = (ordered, totals)
+    return sorted_weights
+
+
+def _best_award(sorted_weights, value, limits):
+    """The most each row can gain from one event worth `value` points, given the rows' weights for the queens who can get it sorted by `_sort_weights`.
+
+    `limits` is (most times one queen gets it, most times it is given in total). A total of None means every queen can get it as many times as one queen can, and None for one queen means up to the total. The queens worth the most to the row get as many as they can until there are none left.
+    """
+    ordered, totals = sorted_weights[1 if value > 0 else -1]
+    n_queens = ordered.shape[1]
+    per_queen, total = limits
+    if total is None:
+        total = n_queens * (per_queen or 1)
+    if per_queen is None:
+        per_queen = total
+    if per_queen == 0:
+        return np.zeros(len(ordered), dtype=ordered.dtype)
+    # The first `n_full` queens get it as many times as they can, and the next one gets what is left
+    n_full = min(total // per_queen, n_queens)
+    best = per_queen * totals[:, n_full]
+    if n_full < n_queens:
+        best = best + (total - per_queen * n_full) * ordered[:, n_full]
+    return abs(value) * best
+
+
+def _best_performance(weights, league, remaining_episodes):
+    """The most performance points each row of `weights` can still add over the rest of the season, where each row weights every queen's performance score.
+
+    Every event is given out as well as it can be for the row within `EVENT_LIMITS` in each of the `remaining_episodes` episodes, then again within the limits of each of the `SPECIAL_EPISODES` that has not aired yet, where any queen can take part. Every event is bounded on its own, so a queen can be in the top and the bottom of the same episode.
+    """
+    best = np.zeros(weights.shape[0], dtype=weights.dtype)
+    if remaining_episodes == 0:
+        return best
+    competing = league.cast.get_ranks().values == 0
+    given = set(league.cast.get_events().get_event_names())
+    competing_weights = _sort_weights(weights[:, competing])
+    all_weights = _sort_weights(weights)
+    for event, value in league.rules.get_event_scores().items():
+        limits = EVENT_LIMITS.get(event, (None, None))
+        best += remaining_episodes * _best_award(competing_weights, value, limits)
+        for name, (aired_event, episode_limits) in SPECIAL_EPISODES.items():
+            if aired_event in given:
+                continue
+            if event in episode_limits:
+                best += _best_award(all_weights, value, episode_limits[event])
+            elif name == "finale" and event not in EVENT_LIMITS:
+                best += _best_award(all_weights, value, (None, None))
+    return best
+
+
+def score_bounds(league, remaining_episodes, n_rivals=10):
+    """Find the best and worst final score each contestant can still get, and who can no longer finish first.
+
+    Each contestant's final score is their score so far, plus the rank score of every queen still competing once she finishes, plus the performance points from the episodes that have not aired. The queens still competing can finish in any order, and can share a place: the runners-up all finish second and queens eliminated together share the highest place between them. The best and worst finishes for a contestant are found without going through every finishing order, see `_best_finish`. Performance points are bounded by giving out every event as well or as badly as it can be for the contestant in every remaining episode, within how often the show gives it out: one or two main challenge winners a week, only the queens still competing in regular episodes, and points for eliminated queens only in the Lip Sync Smackdown and the finale. See `_best_performance`.
+
+    A contestant is mathematically eliminated if one of the `n_rivals` contestants with the best worst-case scores beats them in every possible finish, counting the performance points both can still get. This includes being eliminated because their best case is lower than someone else's worst case. The check can miss contestants who are eliminated, because they are beaten by a different rival in each finish or only by rivals outside the ones checked, but never marks a contestant who can still finish first.
+
+    Queens coming back after being eliminated and events given out more often than `EVENT_LIMITS` and `SPECIAL_EPISODES` allow are not counted, so they can move scores past these bounds.
+
+    Parameters
+    ----------
+    league : League
+        The league to analyze. It is not modified.
+    remaining_episodes : int
+        How many episodes have not aired, including the finale. This can't be worked out from the episodes so far, since episodes without an elimination or with a double elimination change how many are left.
+    n_rivals : int, optional
+        How many of the contestants with the best worst-case scores to check every contestant against. Default is 10.
+
+    Returns
+    -------
+    pd.DataFrame
+        A DataFrame where the index is the contestant's name and the columns are 'current_score' (the score so far, counting only the queens who have been eliminated), 'min_score' and 'max_score' (the lowest and highest final score they can still get) and 'eliminated' (whether they can no longer finish first, counting ties as first).
+    """
+    cast = league.cast
+    ranks = cast.get_ranks().values
+    remaining = np.flatnonzero(ranks == 0)
+
+    queen_lookup = league.rules.get_rank_values("queen", len(ranks))
+    if np.any(np.diff(queen_lookup[1:]) > 0):
+        raise ValueError(
+            "Score bounds need queen rank values that never go up with rank"
+        )
+    team_values = get_team_values(league)
+    team_weights = league.team_weights.values
+    current_scores = (
+        league.total_performance_scores().values + team_values @ queen_lookup[ranks]
+    )
+
+    open_values = team_values[:, remaining]
+    max_scores = (
+        current_scores
+        + _best_finish(open_values, queen_lookup)
+        + _best_performance(team_weights, league, remaining_episodes)
+    )
+    min_scores = (
+        current_scores
+        - _best_finish(-open_values, queen_lookup)
+        - _best_performance(-team_weights, league, remaining_episodes)
+    )
+
+    # A rival beats a contestant in every finish if the contestant's best margin over them is still negative
+    eliminated = np.zeros(len(current_scores), dtype=bool)
+    rivals = np.argsort(-min_scores, kind="stable")[:n_rivals]
+    for rival in rivals:
+        best_margins = (
+            current_scores
+            - current_scores[rival]
+            + _best_finish(open_values - open_values[rival], queen_lookup)
+            + _best_performance(
+                team_weights - team_weights[rival], league, remaining_episodes
+            )
+        )
+        eliminated |= best_margins < 0
+
+    bounds = pd.DataFrame(
+        {
+            "current_score": current_scores,
+            "min_score": min_scores,
+            "max_score": max_scores,
+            "eliminated": eliminated,
+        },
+        index=league.team_weights.index,
+    )
+    return bounds
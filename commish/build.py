@@ -0,0 +1,655 @@
+import os
+import json
+import time
+import hashlib
+from glob import glob
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from .league import League
+from .simulation import simulate_season
+from .rules import read_rules_table, preload_rules_tables, get_rules_tables
+from . import cache
+from .history import HistoryStore
+from . import profiling
+from .markdown import format_table
+from .constants import MAX_ANNOTATED_CELLS
+
+
+@profiling.timed("build.load_league")
+def load_league(season_config, snapshot_dir=None, verify=False):
+    """Create the league for a season and add all of its episodes.
+
+    Parameters
+    ----------
+    season_config : dict
+        The season config, formatted like `schemas/season-config.yml`.
+    snapshot_dir : str, optional
+        Directory for league snapshots. If set, the league resumes from `<snapshot_dir>/<season>.npz` and only adds new episodes, then saves a new snapshot.
+    verify : bool, optional
+        Check the running scores against a full recompute after every episode.
+
+    Returns
+    -------
+    League
+        The league with every episode in the season's `episodes_dir` added.
+    """
+    season = season_config["season"]
+    league = League(
+        season=season,
+        queens_file=season_config["queens"],
+        contestant_file=season_config["contestants"],
+        rank_score_file=season_config["rank_scores"],
+        event_scores_file=season_config["event_scores"],
+        captain_multiplier=season_config.get("captain_multiplier", 2),
+        team_size=season_config.get("team_size", 3),
+        verify=verify,
+    )
+
+    # Add episodes, picking up from the last snapshot if there is one
+    episodes = sorted(glob(os.path.join(season_config["episodes_dir"], "*.json")))
+    if snapshot_dir is not None:
+        snapshot_file = os.path.join(snapshot_dir, f"{season}.npz")
+        if os.path.exists(snapshot_file) and league.load_snapshot(
+            snapshot_file, episodes
+        ):
+            print(f"Resuming from snapshot after episode {league.episode_number}")
+    league.add_episodes(episodes[league.episode_number :])
+    if snapshot_dir is not None:
+        league.save_snapshot(snapshot_file)
+
+    return league
+
+
+@profiling.timed("build.format_rules_tables")
+def format_rules_tables(league):
+    """Format the event and rank score rules as markdown tables."""
+    event_scores = league.rules.get_event_scores()
+    event_scores = event_scores.rename_axis("Event", axis="index").rename("Point Value")
+    event_scores = event_scores.rename(lambda x: x.replace("_", " ").title())
+
+    rank_scores = league.rules.get_rank_scores()
+    rank_scores = rank_scores.rename(
+        columns={
+            "team_score": "Worth of the Team",
+            "queen_score": "Worth of the Queen",
+        }
+    ).rename_axis("Rank", axis="index")
+
+    return format_table(event_scores), format_table(rank_scores)
+
+
+@profiling.timed("build.format_teams_table")
+def format_teams_table(league, team_size):
+    """Format how every contestant ranked the queens as a markdown table. Returns None if there are no contestants yet."""
+    rankings = league.contestants.get_rankings()
+    if len(rankings) == 0:
+        return None
+
+    # One column per contestant, sorted by name, and one row per rank. Keeping the names as objects stops pandas from splitting a wide table into a separate array for each column.
+    names = league.contestants.names
+    order = np.argsort(names.values, kind="stable")
+    teams_table = pd.DataFrame(
+        league.cast.get_queen_names().values[rankings[order]].T,
+        index=pd.Index(np.arange(1, rankings.shape[1] + 1), name="Rank"),
+        columns=pd.Index(names[order], name=""),
+        dtype=object,
+    )
+    if team_size == 3:
+        reindex = {
+            1: "Winner (Captain)",
+            2: "Runner-up (Teammate)",
+            3: "3rd (Teammate)",
+        }
+    elif team_size == 2:
+        reindex = {1: "Winner (Captain)", 2: "Runner-up (Teammate)"}
+    else:
+        reindex = {i: f"{i}th" for i in teams_table.index}
+    teams_table = teams_table.rename(index=reindex)
+    return format_table(teams_table)
+
+
+@profiling.timed("build.format_scores_table")
+def format_scores_table(league):
+    """Format the total scores of every contestant as a markdown table, best score first."""
+    scores = league.total_scores().sort_values("total_score", ascending=False)
+    scores = scores.T.rename(
+        index={
+            "total_performance_score": "Performance Score",
+            "total_rank_score": "Rank Score",
+            "total_score": "Total Score",
+        }
+    ).rename_axis("", axis="columns")
+    return format_table(scores)
+
+
+def _init_plot_worker():
+    """Plots are only ever saved to files, so workers use the non-interactive backend."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _render_plot(draw_func, args, kwargs, path):
+    """Draw a single figure from precomputed scores, save it, and free it."""
+    from . import plotting
+
+    with plotting.use_figure_pool():
+        fig = draw_func(*args, **kwargs)
+        plotting.save_figure(fig, path)
+
+
+@profiling.timed("build.format_odds_table")
+def format_odds_table(
+    league, n_sims=10000, seed=0, remaining_episodes=None, n_finalists=3
+):
+    """Simulate the rest of the season and format each contestant's odds as a markdown table, best chance of winning first. See `simulate_season` for the other arguments."""
+    odds = simulate_season(
+        league,
+        n_sims=n_sims,
+        seed=seed,
+        remaining_episodes=remaining_episodes,
+        n_finalists=n_finalists,
+    )
+    odds = odds.sort_values(["p_first", "expected_score"], ascending=False)
+    odds_table = pd.DataFrame(
+        {
+            "Chance of Winning": odds["p_first"].map(lambda p: f"{p:.1%}"),
+            "Chance of Top Three": odds["p_top_three"].map(lambda p: f"{p:.1%}"),
+            "Expected Score": odds["expected_score"].round().astype(int),
+        }
+    )
+    return format_table(odds_table.T.rename_axis("", axis="columns"))
+
+
+def _hash_plot_inputs(plot_args, kwargs):
+    """Hash the data and options going into a plot, to tell whether it needs to be drawn again."""
+    h = hashlib.sha256(repr(sorted(kwargs.items())).encode())
+    for arg in plot_args:
+        h.update(repr(arg.shape).encode())
+        h.update(pd.util.hash_pandas_object(arg, index=True).values.tobytes())
+        if isinstance(arg, pd.DataFrame):
+            h.update(repr(arg.columns.tolist()).encode())
+    return h.hexdigest()
+
+
+@profiling.timed("build.make_plots")
+def make_plots(league, season_config, plots_dir, jobs=None, plot_hashes=None):
+    """Draw every plot for the scoreboard and save them to `plots_dir`.
+
+    The scores are computed once up front, then every figure is drawn at the same time on a process pool.
+
+    Parameters
+    ----------
+    league : League
+        The league to plot.
+    season_config : dict
+        The season config, which sets the colors used in the plots.
+    plots_dir : str
+        The directory to save the plots to.
+    jobs : int, optional
+        The number of worker processes. Default is one per plot, up to the number of CPUs, or 1 inside a `build_seasons` worker. If 1, the plots are drawn one after another in this process.
+    plot_hashes : dict, optional
+        Maps each plot's file name to a hash of the data it was last drawn from. If given, plots whose data has not changed since then are not drawn again, and the dict is updated with the new hashes.
+
+    Returns
+    -------
+    dict
+        Maps the template key for each plot to its path relative to the page directory.
+    """
+    # matplotlib is slow to import, so only load it when there is something to plot
+    with profiling.stage("build.import_plotting"):
+        from . import plotting
+
+    performance_plot_kwargs = {}
+    if "performance_cmap" in season_config:
+        performance_plot_kwargs["cmap"] = season_config["performance_cmap"]
+
+    rank_scores_kwargs = {}
+    if "rank_scores_cmap" in season_config:
+        rank_scores_kwargs["cmap"] = season_config["rank_scores_cmap"]
+    if "invert_rank_annotation" in season_config:
+        rank_scores_kwargs["low_is_light"] = not season_config["invert_rank_annotation"]
+
+    bar_color = season_config["bar_color"] if "bar_color" in season_config else None
+    second_color = (
+        season_config["second_bar_color"]
+        if "second_bar_color" in season_config
+        else None
+    )
+
+    performance_plot_kwargs["bar_color"] = bar_color
+
+    # Each score frame is only computed once, no matter how many plots use it
+    total_scores = league.total_scores()
+    plot_jobs = [
+        (
+            plotting.draw_total_scores,
+            (total_scores,),
+            {"color": bar_color},
+            "total_scores.png",
+        ),
+        (
+            plotting.draw_total_scores_split,
+            (total_scores,),
+            {"colors": [bar_color, second_color]},
+            "stacked_total_scores.png",
+        ),
+        (
+            plotting.draw_weekly_scores,
+            (league.get_weekly_scores(),),
+            performance_plot_kwargs,
+            "weekly_scores.png",
+        ),
+        (
+            plotting.draw_rank_scores,
+            (league.get_rank_scores(), league.cast.get_ranks()),
+            rank_scores_kwargs,
+            "rank_scores.png",
+        ),
+        (
+            plotting.draw_performance_scores,
+            (league.get_performance_scores(),),
+            performance_plot_kwargs,
+            "weekly_performance_scores.png",
+        ),
+    ]
+
+    plot_paths = {}
+    for _, _, _, filename in plot_jobs:
+        scoring_context_key = filename.replace(".png", "_plot")
+        # Now when we make the page, the path needs to be relative to the page directory
+        plot_paths[scoring_context_key] = os.path.join("plots", filename)
+
+    if plot_hashes is not None:
+        changed_jobs = []
+        for job in plot_jobs:
+            _, plot_args, kwargs, filename = job
+            new_hash = _hash_plot_inputs(plot_args, kwargs)
+            path = os.path.join(plots_dir, filename)
+            if plot_hashes.get(filename) != new_hash or not os.path.exists(path):
+                changed_jobs.append(job)
+            plot_hashes[filename] = new_hash
+        plot_jobs = changed_jobs
+        if len(plot_jobs) == 0:
+            return plot_paths
+
+    if jobs is None:
+        # A season worker from `build_seasons` is already one of a pool, so it doesn't start a pool of its own
+        if _in_season_worker:
+            jobs = 1
+        else:
+            jobs = min(len(plot_jobs), os.cpu_count() or 1)
+    if jobs == 1:
+        for draw_func, plot_args, kwargs, filename in plot_jobs:
+            _render_plot(
+                draw_func, plot_args, kwargs, os.path.join(plots_dir, filename)
+            )
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_plot_worker
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _render_plot,
+                    draw_func,
+                    plot_args,
+                    kwargs,
+                    os.path.join(plots_dir, filename),
+                )
+                for draw_func, plot_args, kwargs, filename in plot_jobs
+            ]
+            for future in futures:
+                future.result()
+    return plot_paths
+
+
+def _get_heatmap_data(scores):
+    """Order the rows of a heatmap the way `plotting.heatmap_bar_biplot` does, highest total first."""
+    totals = scores.sum(axis=1).sort_values()
+    scores = scores.loc[totals.index[::-1]]
+    return {
+        "rows": scores.index.tolist(),
+        "columns": scores.columns.tolist(),
+        "values": scores.values.tolist(),
+        "totals": scores.sum(axis=1).tolist(),
+        "low_is_light": True,
+    }
+
+
+@profiling.timed("build.write_chart_data")
+def write_chart_data(league, season_config, plots_dir):
+    """Write the data behind every plot to `plots_dir/chart-data.json`, for the charts to be drawn in the browser by `site-template/assets/js/charts.js` instead of as images.
+
+    The rows and columns are in the same order as the plots from `make_plots`, and the season config's colors are passed along. matplotlib is never imported.
+
+    Parameters
+    ----------
+    league : League
+        The league to write the charts for.
+    season_config : dict
+        The season config, which sets the colors used in the charts.
+    plots_dir : str
+        The directory to write the chart data to.
+
+    Returns
+    -------
+    dict
+        Maps 'chart_data' to the path of the chart data relative to the page directory.
+    """
+    total_scores = league.total_scores().sort_values("total_score", ascending=False)
+
+    # Queens are ordered by rank with the ones still competing at the bottom, like `plotting.draw_rank_scores`
+    rank_scores = league.get_rank_scores().T
+    ranks = league.cast.get_ranks().copy()
+    ranks[ranks == 0] = max(ranks) + 1
+    rank_scores = rank_scores.loc[ranks.sort_values().index]
+
+    chart_data = {
+        "total_scores": {
+            "names": total_scores.index.tolist(),
+            "performance": total_scores["total_performance_score"].tolist(),
+            "rank": total_scores["total_rank_score"].tolist(),
+            "total": total_scores["total_score"].tolist(),
+        },
+        "weekly_scores": _get_heatmap_data(league.get_weekly_scores()),
+        "weekly_performance_scores": _get_heatmap_data(league.get_performance_scores()),
+        "rank_scores": {
+            "rows": rank_scores.index.tolist(),
+            "columns": rank_scores.columns.tolist(),
+            "values": rank_scores.values.tolist(),
+            "low_is_light": not season_config.get("invert_rank_annotation", True),
+        },
+        "options": {
+            # matplotlib's default colors
+            "bar_color": season_config.get("bar_color", "#1f77b4"),
+            "second_bar_color": season_config.get("second_bar_color", "#ff7f0e"),
+            "performance_cmap": season_config.get("performance_cmap", "PuOr_r"),
+            "rank_scores_cmap": season_config.get("rank_scores_cmap", "plasma"),
+            "max_annotated_cells": MAX_ANNOTATED_CELLS,
+        },
+    }
+    with open(os.path.join(plots_dir, "chart-data.json"), "w") as f:
+        json.dump(chart_data, f, separators=(",", ":"))
+    return {"chart_data": os.path.join("plots", "chart-data.json")}
+
+
+# One Jinja environment per templates directory, shared by every season rendered in this process
+_template_environments = {}
+
+
+def get_template_environment(templates_dir="templates"):
+    """Get the Jinja environment for the templates in `templates_dir`, made on the first call and shared by every season rendered in this process.
+
+    The environment keeps each template after it is first compiled and only compiles it again if the file changes. Compiled templates are also saved to a `FileSystemBytecodeCache` in the system's temporary directory, so new processes and later builds load them instead of compiling them. Jinja is only imported here, so scoring-only tools start faster.
+    """
+    key = os.path.abspath(templates_dir)
+    if key not in _template_environments:
+        from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+        _template_environments[key] = Environment(
+            loader=FileSystemLoader(templates_dir),
+            autoescape=False,
+            bytecode_cache=FileSystemBytecodeCache(),
+        )
+    return _template_environments[key]
+
+
+def render_season(league, season_config, page_dir, plot_jobs=None, state=None):
+    """Write the scoreboard page and plots for a league to `page_dir`.
+
+    Parameters
+    ----------
+    league : League
+        The league for the season.
+    season_config : dict
+        The season config, formatted like `schemas/season-config.yml`.
+    page_dir : str
+        The directory to write `index.md` and the plots to. If the season config has `chart_mode: "client"`, the chart data from `write_chart_data` is written instead of the plots.
+    plot_jobs : int, optional
+        The number of processes used to draw the plots. See `make_plots`.
+    state : dict, optional
+        Things kept between renders of the same league, to only redo the parts that changed. The tables that do not depend on the episodes are only formatted on the first render, and if the dict has a 'plot_hashes' entry, plots whose data has not changed are not drawn again. Pass the same dict every time, and a new one if the league is reloaded.
+    """
+    if state is None:
+        state = {}
+    season = season_config["season"]
+    team_size = season_config.get("team_size", 3)
+    # Set up the scoreboard page
+    env = get_template_environment()
+    if "scoreboard_template" in season_config:
+        template_file = season_config["scoreboard_template"]
+    else:
+        template_file = "season.md.j2"
+
+    scoreboard_template = env.get_template(template_file)
+    has_started = league.episode_number > 0
+    sections = {
+        "scoring": has_started,
+    }
+
+    # Main scoreboard page. The rules and teams never change during a season, so they can be reused between renders.
+    if "rules_tables" not in state:
+        state["rules_tables"] = format_rules_tables(league)
+        state["teams_table"] = format_teams_table(league, team_size)
+    performance_rules, rank_rules = state["rules_tables"]
+    context = {
+        "season": season,
+        "sections": sections,
+        "queen_names": league.cast.get_queen_names().sort_values().tolist(),
+        "has_eliminations": league.cast.num_remaining_queens()
+        < len(league.cast.get_queen_names()),
+        "finished": league.cast.num_remaining_queens() == 0,
+        "performance_rules": performance_rules,
+        "rank_rules": rank_rules,
+        "captain_multiplier": league.rules.get_captain_multiplier(),
+        "intro_text": season_config.get("intro_text", ""),
+    }
+
+    teams_table = state["teams_table"]
+    sections["teams"] = teams_table is not None
+    if teams_table is not None:
+        context["teams_table"] = teams_table
+
+    # Scoring info
+    if has_started:
+        scoring_context = {"scores_table": format_scores_table(league)}
+        if season_config.get("show_odds", False) and not context["finished"]:
+            n_sims = season_config.get("odds_simulations", 10000)
+            scoring_context["odds_simulations"] = n_sims
+            remaining_episodes = None
+            if "n_episodes" in season_config:
+                remaining_episodes = max(
+                    season_config["n_episodes"] - league.episode_number, 0
+                )
+            scoring_context["odds_table"] = format_odds_table(
+                league,
+                n_sims=n_sims,
+                seed=season_config.get("odds_seed", 0),
+                remaining_episodes=remaining_episodes,
+                n_finalists=season_config.get("n_finalists", 3),
+            )
+
+        # The plots need to be in the same directory as the page for the website to build properly
+        plots_dir = os.path.join(page_dir, "plots")
+        os.makedirs(plots_dir, exist_ok=True)
+        if season_config.get("chart_mode", "png") == "client":
+            scoring_context.update(write_chart_data(league, season_config, plots_dir))
+        else:
+            scoring_context.update(
+                make_plots(
+                    league,
+                    season_config,
+                    plots_dir,
+                    jobs=plot_jobs,
+                    plot_hashes=state.get("plot_hashes"),
+                )
+            )
+
+        context["scoring"] = scoring_context
+
+    # Render the page
+    with profiling.stage("build.render"):
+        page = scoreboard_template.render(**context)
+    with open(os.path.join(page_dir, "index.md"), "w") as f:
+        f.write(page)
+
+
+def build_season(
+    season_config,
+    output_dir="site-build",
+    snapshot_dir=None,
+    verify=False,
+    plot_jobs=None,
+    cache_dir=None,
+    history_file=None,
+):
+    """Build the scoreboard page and plots for a season.
+
+    Files are written to `<output_dir>/seasons/<season>`. Templates are read from `templates/`, relative to the working directory.
+
+    Parameters
+    ----------
+    season_config : dict
+        The season config, formatted like `schemas/season-config.yml`.
+    output_dir : str, optional
+        Base directory for files to be output.
+    snapshot_dir : str, optional
+        Directory for league snapshots. See `load_league`.
+    verify : bool, optional
+        Check the running scores against a full recompute after every episode.
+    plot_jobs : int, optional
+        The number of processes used to draw the plots. See `make_plots`.
+    cache_dir : str, optional
+        Directory for the build cache. If set and nothing that goes into the season has changed since it was last built, the page and plots are copied from the cache instead of being built.
+    history_file : str, optional
+        Path to a SQLite history store. If set, the season's scores are recorded in it. See `commish.history.HistoryStore`.
+
+    Returns
+    -------
+    League or None
+        The league for the season, or None if the page was copied from the cache.
+    """
+    season = season_config["season"]
+    page_dir = os.path.join(output_dir, "seasons", str(season))
+    os.makedirs(page_dir, exist_ok=True)
+
+    cache_key = None
+    if cache_dir is not None:
+        cache_key = cache.season_key(season_config)
+        if cache.restore(cache_dir, cache_key, page_dir):
+            print(f"Copied season {season} from the build cache")
+            # The history store may not have seen this build yet, e.g. if it is new
+            if history_file is not None:
+                with HistoryStore(history_file) as store:
+                    if not store.is_current(season, cache_key):
+                        league = load_league(season_config, snapshot_dir=snapshot_dir)
+                        store.record_season(league, build_key=cache_key)
+            return None
+
+    league = load_league(season_config, snapshot_dir=snapshot_dir, verify=verify)
+    render_season(league, season_config, page_dir, plot_jobs=plot_jobs)
+
+    if cache_dir is not None:
+        cache.store(cache_dir, cache_key, page_dir)
+    if history_file is not None:
+        with HistoryStore(history_file) as store:
+            store.record_season(league, build_key=cache_key)
+
+    return league
+
+
+# Set in the worker processes of `build_seasons`
+_in_season_worker = False
+
+
+def _init_season_worker(rules_tables):
+    """Set up a `build_seasons` worker with the rules tables read by the parent process."""
+    global _in_season_worker
+    _in_season_worker = True
+    preload_rules_tables(rules_tables)
+
+
+def _build_season_timed(
+    season_config, output_dir, snapshot_dir, verify, cache_dir, history_file
+):
+    """Build a season in a worker process and report how long it took."""
+    start = time.perf_counter()
+    build_season(
+        season_config,
+        output_dir=output_dir,
+        snapshot_dir=snapshot_dir,
+        verify=verify,
+        cache_dir=cache_dir,
+        history_file=history_file,
+    )
+    return time.perf_counter() - start
+
+
+def build_seasons(
+    season_configs,
+    output_dir="site-build",
+    snapshot_dir=None,
+    verify=False,
+    jobs=None,
+    cache_dir=None,
+    history_file=None,
+):
+    """Build several seasons in parallel on a process pool.
+
+    Rules files shared between seasons are parsed once here and handed to every worker.
+
+    Parameters
+    ----------
+    season_configs : list of dict
+        The season configs, formatted like `schemas/season-config.yml`.
+    output_dir : str, optional
+        Base directory for files to be output.
+    snapshot_dir : str, optional
+        Directory for league snapshots. See `load_league`.
+    verify : bool, optional
+        Check the running scores against a full recompute after every episode.
+    jobs : int, optional
+        The number of worker processes. Default is one per CPU, up to the number of seasons.
+    cache_dir : str, optional
+        Directory for the build cache. See `build_season`.
+    history_file : str, optional
+        Path to a SQLite history store that every season's scores are recorded in. See `build_season`.
+
+    Returns
+    -------
+    dict
+        Maps each season to the number of seconds it took to build.
+    """
+    for season_config in season_configs:
+        read_rules_table(season_config["rank_scores"], index_col="rank")
+        read_rules_table(season_config["event_scores"], index_col="event")
+    rules_tables = get_rules_tables()
+
+    if jobs is None:
+        jobs = min(len(season_configs), os.cpu_count() or 1)
+
+    # Plots are only ever saved to files, so workers don't need an interactive backend
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    timings = {}
+    with ProcessPoolExecutor(
+        max_workers=max(jobs, 1),
+        initializer=_init_season_worker,
+        initargs=(rules_tables,),
+    ) as pool:
+        futures = {
+            season_config["season"]: pool.submit(
+                _build_season_timed,
+                season_config,
+                output_dir,
+                snapshot_dir,
+                verify,
+                cache_dir,
+                history_file,
+            )
+            for season_config in season_configs
+        }
+        for season, future in futures.items():
+            timings[season] = future.result()
+    return timings
@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import functools
+from glob import glob
+
+from . import __version__
+
+# Default upper limit on the total size of the build cache
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+
+def file_hash(path):
+    """Get the SHA-256 hex digest of a file's contents."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def source_hash():
+    """Hash the source files of the `commish` package, so a build made by older code is never reused. The version number alone is not enough, since it is not bumped for every change."""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha256()
+    for path in sorted(glob(os.path.join(package_dir, "*.py"))):
+        h.update(f"\n{os.path.basename(path)}:{file_hash(path)}".encode())
+    return h.hexdigest()
+
+
+def season_key(season_config, templates_dir="templates"):
+    """Hash every input that determines what a season's build outputs look like.
+
+    The key covers the season config itself, the queens, contestants and rules files, every episode JSON, every template, and the version and source code of `commish`.
+
+    Parameters
+    ----------
+    season_config : dict
+        The season config, formatted like `schemas/season-config.yml`.
+    templates_dir : str, optional
+        The directory containing the Jinja templates.
+
+    Returns
+    -------
+    str
+        The hex digest identifying the build.
+    """
+    h = hashlib.sha256()
+    h.update(f"commish {__version__} {source_hash()}\n".encode())
+    h.update(json.dumps(season_config, sort_keys=True, default=str).encode())
+
+    input_files = [
+        season_config["queens"],
+        season_config["contestants"],
+        season_config["rank_scores"],
+        season_config["event_scores"],
+    ]
+    input_files += sorted(glob(os.path.join(season_config["episodes_dir"], "*.json")))
+    input_files += sorted(glob(os.path.join(templates_dir, "**", "*"), recursive=True))
+    for path in input_files:
+        if os.path.isfile(path):
+            h.update(f"\n{os.path.normpath(path)}:{file_hash(path)}".encode())
+    return h.hexdigest()
+
+
+def restore(cache_dir, key, page_dir):
+    """Copy a cached build into `page_dir` if there is one for this key.
+
+    Returns
+    -------
+    bool
+        Whether the build was found in the cache.
+    """
+    entry = os.path.join(cache_dir, key)
+    if not os.path.isdir(entry):
+        return False
+
+    shutil.copytree(entry, page_dir, dirs_exist_ok=True)
+    # Mark the entry as recently used so eviction keeps it
+    now = time.time()
+    os.utime(entry, (now, now))
+    return True
+
+
+def store(cache_dir, key, page_dir, max_bytes=DEFAULT_MAX_BYTES):
+    """Save the contents of `page_dir` in the cache under this key, then evict old entries if the cache is too big."""
+    os.makedirs(cache_dir, exist_ok=True)
+    entry = os.path.join(cache_dir, key)
+    if os.path.isdir(entry):
+        return
+
+    # Copy to a temporary name first so a half-written entry is never picked up
+    tmp_entry = f"{entry}.tmp{os.getpid()}"
+    shutil.rmtree(tmp_entry, ignore_errors=True)
+    shutil.copytree(page_dir, tmp_entry)
+    try:
+        os.replace(tmp_entry, entry)
+    except OSError:
+        # Another process stored the same build first
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+    evict(cache_dir, max_bytes=max_bytes)
+
+
+def _dir_size(path):
+    """Get the total size of the files in a directory, in bytes."""
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            size += os.path.getsize(os.path.join(root, name))
+    return size
+
+
+def evict(cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+    """Remove the least recently used entries until the cache is no bigger than `max_bytes`."""
+    entries = []
+    for name in os.listdir(cache_dir):
+        entry = os.path.join(cache_dir, name)
+        if os.path.isdir(entry) and ".tmp" not in name:
+            entries.append((os.path.getmtime(entry), _dir_size(entry), entry))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
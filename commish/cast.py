@@ -1,11 +1,16 @@
+import numpy as np
 import pandas as pd
 
+from .events import EventLog
 from .queen import Queen
+from .registry import QueenRegistry
 
 
 class Cast:
     """The class for managing the cast of queens in this season of RuPaul's Drag Race.
 
+    The state of the cast is held as parallel NumPy arrays indexed by an integer queen id, which is the position of the queen in the queens file.
+
     Parameters
     ----------
     queens_file : str
@@ -13,42 +18,65 @@ class Cast:
 
     Attributes
     ----------
-    queens : pd.DataFrame
-        A DataFrame containing the Queen objects in the cast, indexed by queen name.
+    registry : QueenRegistry
+        Maps each queen's name to her id.
+    names : pd.Index
+        The names of the queens in the cast. The position of a name is the queen's id.
+    rank : np.ndarray
+        The rank of each queen in the competition. 0 if the queen is still competing.
+    week_eliminated : np.ndarray
+        The week each queen was eliminated. Only meaningful where `eliminated` is True.
+    eliminated : np.ndarray
+        Whether each queen has been eliminated.
+    events : EventLog
+        The log of every performance event in the season.
     """
 
     def __init__(self, queens_file):
-        queens = []
+        names = []
         with open(queens_file, "r") as f:
             for line in f:
-                queen_name = line.strip()
-                queens.append(Queen(queen_name))
-        queens = pd.DataFrame({"queen": queens})
-        queens["name"] = queens["queen"].apply(lambda q: q.get_name())
-        queens = queens.set_index("name", drop=False)
-        self.queens = queens
-
-    def _assert_queen_exists(self, queen_name):
-        """Make sure a queen's name is in the cast before trying to access it."""
-        assert queen_name in self.queens.index.values, (
-            f"Queen {queen_name} not found in cast"
-        )
+                names.append(line.strip())
+        self.registry = QueenRegistry(names)
+        self.names = self.registry.get_names()
+
+        n_queens = len(self.names)
+        self.rank = np.zeros(n_queens, dtype=int)
+        self.week_eliminated = np.zeros(n_queens, dtype=int)
+        self.eliminated = np.zeros(n_queens, dtype=bool)
+        self.events = EventLog()
+        self.n_remaining = n_queens
+
+    def get_queen_names(self):
+        """Get the names of the queens in the cast, in id order."""
+        return self.names
+
+    def get_registry(self):
+        """Get the registry that maps queen names to ids."""
+        return self.registry
+
+    def get_queen_id(self, queen_name):
+        """Get the integer id of a queen in the cast by name."""
+        return self.registry.get_id(queen_name)
 
     def get_queens(self):
-        """Get the DataFrame of Queen objects in the cast."""
-        return self.queens
+        """Get a DataFrame of Queen objects in the cast, indexed by queen name."""
+        queens = pd.DataFrame(
+            {
+                "queen": [Queen(self, i) for i in range(len(self.names))],
+                "name": self.names,
+            },
+            index=self.names,
+        )
+        return queens
 
     def get_queen(self, queen_name):
         """Get a specific Queen object from the cast by name."""
-        self._assert_queen_exists(queen_name)
-        return self.queens.loc[queen_name, "queen"]
+        return Queen(self, self.get_queen_id(queen_name))
 
     def get_ranks(self):
         """Get the current ranks of all queens in the cast. If a queen has not been eliminated, their rank is 0."""
-        ranks = self.queens.apply(lambda row: row["queen"].get_rank(), axis=1).rename(
-            "rank"
-        )
-        return ranks
+        return pd.Series(self.rank.copy(), index=self.names, name="rank")
 
     def get_performances(self):
         """Get the performance events for all queens in the cast.
@@ -58,20 +86,11 @@ class Cast:
         pd.DataFrame
             A DataFrame containing all performance events for all queens, with columns for queen name, event, week, and any other relevant information.
         """
-        performances = []
-        for name, queen in self.queens["queen"].items():
-            events = queen.get_performance_events()
-            events["queen"] = name
-            performances.append(events)
-
-        performances = pd.concat(performances).reset_index(drop=True)
-        return performances
+        return self.events.to_frame(self.names)
 
     def num_remaining_queens(self):
         """Get the number of queens in the cast who have not been eliminated yet."""
-        eliminated_mask = self.get_queens()["queen"].apply(lambda q: q.is_eliminated())
-        num_remaining = sum(~eliminated_mask)
-        return num_remaining
+        return self.n_remaining
 
     def eliminate_queen(self, queen_name, week, rank):
         """Eliminate a queen from the cast.
@@ -87,8 +106,15 @@ class Cast:
         rank : int
             The rank to assign to the queen upon elimination.
         """
-        queen = self.get_queen(queen_name)
-        queen.eliminate(week, rank)
+        self.eliminate_queen_id(self.get_queen_id(queen_name), week, rank)
+
+    def eliminate_queen_id(self, queen_id, week, rank):
+        """Eliminate a queen from the cast by id. See `eliminate_queen`."""
+        if not self.eliminated[queen_id]:
+            self.n_remaining -= 1
+        self.eliminated[queen_id] = True
+        self.week_eliminated[queen_id] = week
+        self.rank[queen_id] = rank
 
     def return_queen(self, queen_name):
         """Return a previously eliminated queen to the cast.
@@ -104,7 +130,26 @@ class Cast:
         int
             The rank of the queen before being returned.
         """
-        queen = self.get_queen(queen_name)
-        old_rank = queen.get_rank()
-        queen.return_to_competition()
+        return self.return_queen_id(self.get_queen_id(queen_name))
+
+    def return_queen_id(self, queen_id):
+        """Return a previously eliminated queen to the cast by id. See `return_queen`."""
+        old_rank = int(self.rank[queen_id])
+        if self.eliminated[queen_id]:
+            self.n_remaining += 1
+        self.eliminated[queen_id] = False
+        self.week_eliminated[queen_id] = 0
+        self.rank[queen_id] = 0
         return old_rank
+
+    def get_events(self):
+        """Get the log of every performance event in the season."""
+        return self.events
+
+    def add_performance_events(self, queen_ids, events, week):
+        """Log performance events for a week. `queen_ids` and `events` are parallel sequences."""
+        self.events.append(week, queen_ids, events)
+
+    def demote_queens(self, rank):
+        """Drop every eliminated queen who placed better than the given rank down by one place, to make room for a queen who returned from that rank."""
+        self.rank[self.eliminated & (self.rank < rank)] += 1
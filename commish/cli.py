@@ -0,0 +1,321 @@
+import os
+import sys
+import json
+import argparse
+import contextlib
+import yaml
+from glob import glob
+
+from .build import load_league, build_season
+from .history import HistoryStore
+from .analysis import score_bounds
+
+
+def format_scores(league, weekly=False, fmt="json"):
+    """Format the standings for a league as JSON or TSV.
+
+    Parameters
+    ----------
+    league : League
+        The league to report on.
+    weekly : bool, optional
+        Also include each contestant's performance score for every week.
+    fmt : str, optional
+        Either "json" or "tsv".
+
+    Returns
+    -------
+    str
+        The standings, with the highest total score first.
+    """
+    scores = league.total_scores().sort_values("total_score", ascending=False)
+    weekly_scores = league.get_weekly_scores().loc[scores.index]
+
+    if fmt == "tsv":
+        if weekly:
+            weekly_scores.columns = [f"week_{w}" for w in weekly_scores.columns]
+            scores = scores.join(weekly_scores)
+        return scores.to_csv(sep="\t")
+
+    if fmt == "json":
+        standings = []
+        for name, row in scores.iterrows():
+            entry = {"name": name, **{k: int(v) for k, v in row.items()}}
+            if weekly:
+                entry["weekly_scores"] = {
+                    str(w): int(v) for w, v in weekly_scores.loc[name].items()
+                }
+            standings.append(entry)
+        report = {
+            "season": league.season,
+            "episode": league.episode_number,
+            "standings": standings,
+        }
+        return json.dumps(report, indent=4) + "\n"
+
+    raise ValueError(f"Unknown format {fmt}, must be json or tsv")
+
+
+def scores_command(args):
+    """Print or write the standings for a season."""
+    with open(args.season_config, "r") as f:
+        season_config = yaml.safe_load(f)
+
+    # Progress messages go to stderr so they don't get mixed into the scores
+    with contextlib.redirect_stdout(sys.stderr):
+        league = load_league(season_config, snapshot_dir=args.snapshot_dir)
+    output = format_scores(league, weekly=args.weekly, fmt=args.format)
+
+    if args.output is None:
+        sys.stdout.write(output)
+    else:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+
+def build_command(args):
+    """Build the scoreboard page and plots for a season."""
+    with open(args.season_config, "r") as f:
+        season_config = yaml.safe_load(f)
+    build_season(
+        season_config,
+        output_dir=args.output_dir,
+        snapshot_dir=args.snapshot_dir,
+    )
+
+
+def _write_table(table, fmt, output):
+    """Print or write a DataFrame as JSON or TSV."""
+    if fmt == "tsv":
+        text = table.to_csv(sep="\t")
+    else:
+        text = table.reset_index().to_json(orient="records", indent=4) + "\n"
+    if output is None:
+        sys.stdout.write(text)
+    else:
+        with open(output, "w") as f:
+            f.write(text)
+
+
+def bounds_command(args):
+    """Print the best and worst final score each contestant can still get, and who can no longer win."""
+    with open(args.season_config, "r") as f:
+        season_config = yaml.safe_load(f)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        league = load_league(season_config, snapshot_dir=args.snapshot_dir)
+    remaining_episodes = args.remaining_episodes
+    if remaining_episodes is None:
+        if "n_episodes" not in season_config:
+            sys.exit(
+                "commish bounds: pass --remaining-episodes or set n_episodes in the season config"
+            )
+        remaining_episodes = max(season_config["n_episodes"] - league.episode_number, 0)
+    bounds = score_bounds(league, remaining_episodes).sort_values(
+        ["max_score", "min_score"], ascending=False
+    )
+    _write_table(bounds, args.format, args.output)
+
+
+def leaderboard_command(args):
+    """Print the all-time leaderboard from a history store."""
+    with HistoryStore(args.history_file) as store:
+        _write_table(store.get_leaderboard(), args.format, args.output)
+
+
+def player_command(args):
+    """Print one contestant's results in every season from a history store."""
+    with HistoryStore(args.history_file) as store:
+        if args.weekly:
+            history = store.get_weekly_history(args.name).set_index("season")
+        else:
+            history = store.get_player_history(args.name)
+    _write_table(history, args.format, args.output)
+
+
+def serve_command(args):
+    """Serve every season's scores as JSON until the process is stopped."""
+    import asyncio
+    from .server import ScoreboardServer
+
+    season_configs = []
+    for config_file in sorted(glob(os.path.join(args.config_dir, "*.yml"))):
+        with open(config_file, "r") as f:
+            season_configs.append(yaml.safe_load(f))
+    poll_interval = args.poll_interval if args.poll_interval > 0 else None
+    server = ScoreboardServer(
+        season_configs, snapshot_dir=args.snapshot_dir, poll_interval=poll_interval
+    )
+    try:
+        asyncio.run(server.serve(host=args.host, port=args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    """Entry point for the `commish` command."""
+    parser = argparse.ArgumentParser(
+        prog="commish", description="Manage a RuPaul's Drag Race fantasy league."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scores_parser = subparsers.add_parser(
+        "scores",
+        help="Print the standings for a season without drawing plots or rendering pages.",
+    )
+    scores_parser.add_argument(
+        "--season-config",
+        type=str,
+        help="Path to season config YAML file.",
+        required=True,
+    )
+    scores_parser.add_argument(
+        "--format",
+        type=str,
+        choices=["json", "tsv"],
+        default="json",
+        help="Output format.",
+    )
+    scores_parser.add_argument(
+        "--weekly",
+        action="store_true",
+        help="Include each contestant's performance score for every week.",
+    )
+    scores_parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="File to write the scores to. Default is to print them.",
+    )
+    scores_parser.add_argument(
+        "--snapshot_dir",
+        type=str,
+        default=None,
+        help="Directory for league snapshots. See bin/create_league.py.",
+    )
+    scores_parser.set_defaults(func=scores_command)
+
+    build_parser = subparsers.add_parser(
+        "build", help="Build the scoreboard page and plots for a season."
+    )
+    build_parser.add_argument(
+        "--season-config",
+        type=str,
+        help="Path to season config YAML file.",
+        required=True,
+    )
+    build_parser.add_argument(
+        "--output_dir",
+        type=str,
+        help="Base directory for files to be output. Things will go to <output_dir>/seasons/<season>",
+        default="site-build",
+    )
+    build_parser.add_argument(
+        "--snapshot_dir",
+        type=str,
+        default=None,
+        help="Directory for league snapshots. See bin/create_league.py.",
+    )
+    build_parser.set_defaults(func=build_command)
+
+    bounds_parser = subparsers.add_parser(
+        "bounds",
+        help="Print the best and worst final score each contestant can still get, and who is mathematically eliminated.",
+    )
+    bounds_parser.add_argument(
+        "--season-config",
+        type=str,
+        help="Path to season config YAML file.",
+        required=True,
+    )
+    bounds_parser.add_argument(
+        "--remaining-episodes",
+        type=int,
+        default=None,
+        help="How many episodes have not aired, including the finale. Default is worked out from n_episodes in the season config.",
+    )
+    bounds_parser.add_argument(
+        "--format",
+        type=str,
+        choices=["json", "tsv"],
+        default="json",
+        help="Output format.",
+    )
+    bounds_parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="File to write to. Default is to print.",
+    )
+    bounds_parser.add_argument(
+        "--snapshot_dir",
+        type=str,
+        default=None,
+        help="Directory for league snapshots. See bin/create_league.py.",
+    )
+    bounds_parser.set_defaults(func=bounds_command)
+
+    leaderboard_parser = subparsers.add_parser(
+        "leaderboard",
+        help="Print the all-time leaderboard from a history store, without rebuilding any seasons.",
+    )
+    player_parser = subparsers.add_parser(
+        "player", help="Print one contestant's results in every season."
+    )
+    player_parser.add_argument("name", type=str, help="The contestant's name.")
+    player_parser.add_argument(
+        "--weekly",
+        action="store_true",
+        help="Print the contestant's score for every week instead of every season.",
+    )
+    for history_parser in [leaderboard_parser, player_parser]:
+        history_parser.add_argument(
+            "--history_file",
+            type=str,
+            default=".history.sqlite",
+            help="SQLite file written by bin/build_site.py --history_file.",
+        )
+        history_parser.add_argument(
+            "--format",
+            type=str,
+            choices=["json", "tsv"],
+            default="json",
+            help="Output format.",
+        )
+        history_parser.add_argument(
+            "--output",
+            type=str,
+            default=None,
+            help="File to write to. Default is to print.",
+        )
+    leaderboard_parser.set_defaults(func=leaderboard_command)
+    player_parser.set_defaults(func=player_command)
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Serve every season's scores as JSON from memory, adding new episodes as they appear.",
+    )
+    serve_parser.add_argument(
+        "--config_dir",
+        type=str,
+        default="season-configs",
+        help="Directory containing the season config YAML files.",
+    )
+    serve_parser.add_argument("--host", type=str, default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument(
+        "--poll_interval",
+        type=float,
+        default=5.0,
+        help="How often to check for new episode files, in seconds. 0 turns polling off.",
+    )
+    serve_parser.add_argument(
+        "--snapshot_dir",
+        type=str,
+        default=None,
+        help="Directory for league snapshots. See bin/create_league.py.",
+    )
+    serve_parser.set_defaults(func=serve_command)
+
+    args = parser.parse_args(argv)
+    args.func(args)
@@ -0,0 +1,2 @@
+# Heatmaps with more cells than this are drawn without a text label in each cell. Kept out of `commish.plotting` so the page and chart data can use it without loading matplotlib.
+MAX_ANNOTATED_CELLS = 2500
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -47,22 +48,31 @@ class Contestant:
 class Contestants:
     """The class for managing the contestants in the fantasy league.
 
+    The rankings are held as a single contestants x ranks matrix of integer queen ids, where a queen's id is her position in `queen_names`.
+
     Parameters
     ----------
     contestant_file : str
         The path to the file containing the contestants' data. Each row is a contestant and their rankings of the queens. The header row is skipped.
-    n_queens : int
-        The number of queens in the cast.
+    registry : QueenRegistry
+        The registry that maps each queen's name in the cast to her id.
     team_size : int, optional
         The number of queens on each contestant's team (including the captain). Default is 3.
 
     Attributes
     ----------
-    contestants : pd.DataFrame
-        A DataFrame where the index is the contestant's name and there is a column "contestant" containing the Contestant objects.
+    names : pd.Index
+        The names of the contestants, in the order they appear in the file.
+    queen_names : pd.Index
+        The names of the queens in the cast, in id order.
+    rankings : np.ndarray
+        An int16 matrix with one row per contestant and one column per rank. Each entry is the id of the queen the contestant put at that rank, so the first column holds the captains.
+    team_size : int
+        The number of queens on each contestant's team (including the captain).
     """
 
-    def __init__(self, contestant_file, n_queens, team_size=3):
+    def __init__(self, contestant_file, registry, team_size=3):
+        n_queens = len(registry)
         names = ["name"] + [str(i) for i in range(1, n_queens + 1)]
         contestants_df = pd.read_csv(
             contestant_file,
@@ -72,37 +82,87 @@ class Contestants:
             skiprows=1,
             index_col="name",
             comment="#",
+            dtype=str,
         )
-        contestants = pd.Series(
-            {
-                name: Contestant(
-                    name,
-                    data.rename("queen").reset_index(drop=True).to_frame(),
-                    team_size=team_size,
-                )
-                for name, data in contestants_df.iterrows()
-            }
+        self.names = pd.Index(contestants_df.index, name="name")
+        self.queen_names = registry.get_names()
+        self.team_size = team_size
+
+        # Map every cell to a queen id in one pass. Unknown or missing queens get -1
+        codes = registry.get_indexer(contestants_df.values.ravel())
+        self.rankings = codes.reshape(contestants_df.shape).astype(np.int16)
+        self._validate(contestants_df)
+
+    def _validate(self, contestants_df, max_errors=10):
+        """Make sure every contestant has a unique name and ranked every queen in the cast exactly once."""
+        errors = []
+        duplicate_names = self.names[self.names.duplicated()].unique()
+        for name in duplicate_names:
+            errors.append(f"Contestant {name} has more than one submission")
+
+        # A valid row is a permutation of the queen ids, so sorting it gives 0, 1, ..., n - 1
+        expected = np.arange(len(self.queen_names), dtype=np.int16)
+        invalid_rows = np.flatnonzero(
+            ~(np.sort(self.rankings, axis=1) == expected).all(axis=1)
         )
+        for i in invalid_rows:
+            name = self.names[i]
+            row = self.rankings[i]
+            unknown = contestants_df.iloc[i].values[row < 0]
+            missing = [q for q in unknown if pd.isna(q)]
+            unknown = [q for q in unknown if not pd.isna(q)]
+            ids, counts = np.unique(row[row >= 0], return_counts=True)
+            duplicates = self.queen_names[ids[counts > 1]].tolist()
+            if len(unknown) > 0:
+                errors.append(
+                    f"Contestant {name} ranked queens not in the cast: {unknown}"
+                )
+            if len(missing) > 0:
+                errors.append(f"Contestant {name} left {len(missing)} rank(s) empty")
+            if len(duplicates) > 0:
+                errors.append(
+                    f"Contestant {name} ranked queens more than once: {duplicates}"
+                )
 
-        contestants.index.name = "name"
-        contestants = contestants.rename("contestant").to_frame()
-        contestants["name"] = contestants.index
-        self.contestants = contestants
+        if len(errors) > 0:
+            n_errors = len(errors)
+            errors = errors[:max_errors]
+            if n_errors > max_errors:
+                errors.append(f"... and {n_errors - max_errors} more")
+            raise ValueError("Invalid contestant submissions:\n" + "\n".join(errors))
 
     def _assert_contestant_exists(self, contestant_name):
         """Make sure the contestant exists in the contestants DataFrame."""
-        assert contestant_name in self.contestants.index.values, (
+        assert contestant_name in self.names, (
             f"Contestant {contestant_name} not found in contestants"
         )
 
+    def _make_contestant(self, i):
+        """Create the Contestant object for the contestant in row `i`."""
+        queen_rankings = pd.DataFrame({"queen": self.queen_names[self.rankings[i]]})
+        return Contestant(self.names[i], queen_rankings, team_size=self.team_size)
+
+    def get_rankings(self):
+        """Get the contestants x ranks matrix of queen ids."""
+        return self.rankings
+
     def get_contestants(self):
-        """Get the DataFrame of all contestants."""
-        return self.contestants
+        """Get a DataFrame of all contestants, where the index is the contestant's name and there is a column "contestant" containing the Contestant objects."""
+        contestants = pd.DataFrame(
+            {
+                "contestant": [
+                    self._make_contestant(i) for i in range(len(self.names))
+                ],
+                "name": self.names,
+            },
+            index=self.names,
+        )
+        return contestants
 
     def get_contestant(self, contestant_name):
         """Get a specific Contestant object by name."""
         self._assert_contestant_exists(contestant_name)
-        return self.contestants.loc[contestant_name, "contestant"]
+        return self._make_contestant(self.names.get_loc(contestant_name))
 
     def get_queen_rankings(self):
         """Get the queen rankings for all contestants.
@@ -113,7 +173,7 @@ class Contestants:
             A Series where the index is the contestant's name and the values are DataFrames of queen rankings for each contestant.
         """
         rankings = (
-            self.contestants["contestant"]
+            self.get_contestants()["contestant"]
             .apply(lambda c: c.get_queen_rankings())
             .rename("queen_rankings")
         )
@@ -127,10 +187,8 @@ class Contestants:
         pd.Series
             A Series where the index is the contestant's name and the values are the captains (the queen ranked first) for each contestant.
         """
-        captains = (
-            self.contestants["contestant"]
-            .apply(lambda c: c.get_captain())
-            .rename("captain")
+        captains = pd.Series(
+            self.queen_names[self.rankings[:, 0]], index=self.names, name="captain"
         )
         return captains
 
@@ -142,6 +200,5 @@ class Contestants:
         pd.Series
             A Series where the index is the contestant's name and the values are the teams (the first `team_size` queens ranked) for each contestant.
         """
-        return (
-            self.contestants["contestant"].apply(lambda c: c.get_team()).rename("team")
-        )
+        teams = self.queen_names.values[self.rankings[:, : self.team_size]]
+        return pd.Series(list(teams), index=self.names, name="team", dtype=object)
@@ -1,4 +1,5 @@
 import json
+import numpy as np
 import pandas as pd
 
 
@@ -9,6 +10,8 @@ class Episode:
     ----------
     file : str
         The path to the episode data file (JSON format).
+    registry : QueenRegistry, optional
+        The registry of queens in the cast. If provided, every queen's name in the episode is translated to an id when the file is read, and any names not in the cast are reported together in a single error.
 
     Attributes
     ----------
@@ -22,9 +25,11 @@ class Episode:
         A dictionary of performance events and a list of queens associated with them. Also contains information on double shantay/sashay.
     finale_data : dict
         A dictionary containing the winner and runners-up information for the finale episode.
+    registry : QueenRegistry or None
+        The registry of queens in the cast, if one was provided.
     """
 
-    def __init__(self, file):
+    def __init__(self, file, registry=None):
         with open(file) as f:
             data = json.load(f)
 
@@ -34,6 +39,38 @@ class Episode:
         self.returning_queen = data.get("returning_queen", [])
         self.performance = data["performance"]
         self.finale_data = data["finale_data"]
+        self.registry = registry
+
+        if registry is not None:
+            self._translate_queens(file)
+
+    def _translate_queens(self, file):
+        """Look up the id of every queen in the episode at once, so unknown names are all reported together."""
+        performance = self.get_performance()
+        winner = self.finale_data["winner"][:1] if self.finale else []
+        runners_up = self.finale_data["runners_up"] if self.finale else []
+        names = (
+            list(self.queen_eliminated)
+            + list(self.returning_queen)
+            + performance["queen"].tolist()
+            + list(winner)
+            + list(runners_up)
+        )
+        ids = self.registry.translate(names, f"Episode file {file}")
+
+        sizes = np.cumsum(
+            [
+                len(self.queen_eliminated),
+                len(self.returning_queen),
+                len(performance),
+                len(winner),
+            ]
+        )
+        eliminated, returning, performers, winner, runners_up = np.split(ids, sizes)
+        self.queen_eliminated_ids = eliminated
+        self.returning_queen_ids = returning
+        self.performance_ids = (performance["event"].to_numpy(dtype=object), performers)
+        self.finale_data_ids = (int(winner[0]) if len(winner) > 0 else None, runners_up)
 
     def get_episode_number(self):
         """Get the episode number."""
@@ -72,3 +109,29 @@ class Episode:
         """Get the winner and runners-up information for the finale episode."""
         data = self.finale_data
         return data["winner"][0], data["runners_up"]
+
+    def _assert_translated(self):
+        """Make sure the queen ids are available before trying to access them."""
+        assert self.registry is not None, (
+            "Queen ids are only available if the episode was read with a registry"
+        )
+
+    def get_eliminated_queen_ids(self):
+        """Get the ids of the queens eliminated in this episode."""
+        self._assert_translated()
+        return self.queen_eliminated_ids
+
+    def get_returning_queen_ids(self):
+        """Get the ids of the queens returning in this episode."""
+        self._assert_translated()
+        return self.returning_queen_ids
+
+    def get_performance_ids(self):
+        """Get the performance events and the ids of the associated queens as two parallel arrays."""
+        self._assert_translated()
+        return self.performance_ids
+
+    def get_finale_data_ids(self):
+        """Get the id of the winner and the ids of the runners-up for the finale episode."""
+        self._assert_translated()
+        return self.finale_data_ids
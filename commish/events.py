@@ -0,0 +1,171 @@
+import os
+import numpy as np
+import pandas as pd
+
+# The columns stored in the event log, in the order they are saved
+COLUMNS = ["week", "queen", "event"]
+
+
+class EventLog:
+    """An append-only log of every performance event in a season.
+
+    Events are held in three parallel NumPy columns: the week, the id of the queen, and the id of the event. Event names are mapped to ids in the order they are first seen. The columns grow by doubling, so appending is amortized O(1) per event.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        How many events to make room for up front. Default is 256.
+
+    Attributes
+    ----------
+    columns : dict
+        Maps each column name to its backing array. Only the first `size` entries are filled in.
+    size : int
+        The number of events in the log.
+    event_names : list of str
+        The name of each event, in id order.
+    event_ids : dict
+        Maps each event name to its id.
+    """
+
+    def __init__(self, capacity=256):
+        self.columns = {name: np.zeros(capacity, dtype=np.int32) for name in COLUMNS}
+        self.size = 0
+        self.event_names = []
+        self.event_ids = {}
+
+    def __len__(self):
+        return self.size
+
+    def _get_event_ids(self, events):
+        """Get the id of each event name, adding any names that have not been seen yet."""
+        for e in events:
+            if e not in self.event_ids:
+                self.event_ids[e] = len(self.event_names)
+                self.event_names.append(e)
+        return np.array([self.event_ids[e] for e in events], dtype=np.int32)
+
+    def append(self, week, queen_ids, events):
+        """Add a week's events to the end of the log.
+
+        Parameters
+        ----------
+        week : int
+            The week the events happened.
+        queen_ids : sequence of int
+            The id of the queen for each event.
+        events : sequence of str
+            The name of each event, parallel to `queen_ids`.
+        """
+        n = len(events)
+        assert len(queen_ids) == n, "Every event needs exactly one queen"
+        if n == 0:
+            return
+        needed = self.size + n
+        capacity = len(self.columns["week"])
+        # Memory-mapped columns are copied into memory instead of written to
+        if needed > capacity or isinstance(self.columns["week"], np.memmap):
+            capacity = max(needed, 2 * capacity)
+            for name, column in self.columns.items():
+                grown = np.zeros(capacity, dtype=column.dtype)
+                grown[: self.size] = column[: self.size]
+                self.columns[name] = grown
+
+        self.columns["week"][self.size : needed] = week
+        self.columns["queen"][self.size : needed] = queen_ids
+        self.columns["event"][self.size : needed] = self._get_event_ids(events)
+        self.size = needed
+
+    def get_weeks(self):
+        """Get the week of every event."""
+        return self.columns["week"][: self.size]
+
+    def get_queen_ids(self):
+        """Get the id of the queen for every event."""
+        return self.columns["queen"][: self.size]
+
+    def get_event_ids(self):
+        """Get the id of every event."""
+        return self.columns["event"][: self.size]
+
+    def get_event_names(self):
+        """Get the name of each event id."""
+        return self.event_names
+
+    def get_event_values(self, event_scores):
+        """How many points is each event in the log worth?
+
+        Parameters
+        ----------
+        event_scores : pd.Series
+            Maps event name to score, as returned by `Rules.get_event_scores`. Events missing from it are worth 0.
+
+        Returns
+        -------
+        np.ndarray
+            The score of every event in the log.
+        """
+        lookup = event_scores.reindex(self.event_names).fillna(0).astype(int).values
+        return lookup[self.get_event_ids()]
+
+    def to_frame(self, queen_names):
+        """Get the log as a DataFrame with columns for the week, event name and queen name."""
+        return pd.DataFrame(
+            {
+                "week": self.get_weeks().astype(int),
+                "event": np.array(self.event_names, dtype=object)[self.get_event_ids()],
+                "queen": np.asarray(queen_names)[self.get_queen_ids()],
+            }
+        )
+
+    def get_arrays(self):
+        """Get the filled-in columns and the event names as a dict of arrays, for saving."""
+        arrays = {name: column[: self.size] for name, column in self.columns.items()}
+        arrays["event_names"] = np.array(self.event_names, dtype=str)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Create a log from the arrays returned by `get_arrays`."""
+        log = cls(capacity=max(len(arrays["week"]), 1))
+        log.event_names = arrays["event_names"].tolist()
+        log.event_ids = {e: i for i, e in enumerate(log.event_names)}
+        log.size = len(arrays["week"])
+        for name in COLUMNS:
+            log.columns[name][: log.size] = arrays[name]
+        return log
+
+    def save(self, path):
+        """Save the log to a single `.npz` file."""
+        np.savez(path, **self.get_arrays())
+
+    def export(self, directory):
+        """Save each column of the log to its own `.npy` file in `directory`, so other tools can memory-map them with `np.load(..., mmap_mode="r")`."""
+        os.makedirs(directory, exist_ok=True)
+        for name, array in self.get_arrays().items():
+            np.save(os.path.join(directory, f"{name}.npy"), array)
+
+    @classmethod
+    def load(cls, path, mmap_mode=None):
+        """Load a log saved by `save` (a `.npz` file) or `export` (a directory of `.npy` files).
+
+        With `mmap_mode`, exported columns are memory-mapped instead of read into memory. They are copied into memory the first time more events are appended.
+        """
+        if os.path.isdir(path):
+            arrays = {
+                name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+                for name in COLUMNS + ["event_names"]
+            }
+        else:
+            with np.load(path) as npz:
+                arrays = dict(npz)
+
+        if mmap_mode is None:
+            return cls.from_arrays(arrays)
+
+        log = cls(capacity=0)
+        log.columns = {name: arrays[name] for name in COLUMNS}
+        log.size = len(arrays["week"])
+        log.event_names = arrays["event_names"].tolist()
+        log.event_ids = {e: i for i, e in enumerate(log.event_names)}
+        return log
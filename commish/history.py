@@ -0,0 +1,264 @@
+import time
+import sqlite3
+import numpy as np
+import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seasons (
+    season TEXT PRIMARY KEY,
+    episode INTEGER NOT NULL,
+    finished INTEGER NOT NULL,
+    input_hash TEXT NOT NULL,
+    episode_hashes TEXT NOT NULL,
+    build_key TEXT,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS total_scores (
+    season TEXT NOT NULL,
+    contestant TEXT NOT NULL,
+    place INTEGER NOT NULL,
+    total_performance_score INTEGER NOT NULL,
+    total_rank_score INTEGER NOT NULL,
+    total_score INTEGER NOT NULL,
+    PRIMARY KEY (season, contestant)
+);
+CREATE INDEX IF NOT EXISTS total_scores_contestant ON total_scores (contestant);
+CREATE TABLE IF NOT EXISTS weekly_scores (
+    season TEXT NOT NULL,
+    contestant TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (season, contestant, week)
+);
+CREATE INDEX IF NOT EXISTS weekly_scores_contestant ON weekly_scores (contestant);
+CREATE TABLE IF NOT EXISTS rankings (
+    season TEXT NOT NULL,
+    contestant TEXT NOT NULL,
+    queen TEXT NOT NULL,
+    predicted_rank INTEGER NOT NULL,
+    actual_rank INTEGER NOT NULL,
+    PRIMARY KEY (season, contestant, queen)
+);
+CREATE INDEX IF NOT EXISTS rankings_contestant ON rankings (contestant);
+"""
+
+
+class HistoryStore:
+    """A SQLite database of the scores from every season, for statistics across seasons without rebuilding any leagues.
+
+    Each season build writes its total scores, weekly scores and the contestants' rankings of the queens into the store. Seasons are keyed by name, so rebuilding a season replaces its rows. When a season only has new episodes since it was last recorded, only the new weeks are written.
+
+    Parameters
+    ----------
+    path : str
+        The path to the SQLite database file. It is created if it does not exist.
+
+    Attributes
+    ----------
+    path : str
+        The path to the SQLite database file.
+    connection : sqlite3.Connection
+        The open connection to the database.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # Several season builds can write at once, so wait for each other's transactions
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Close the connection to the database."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def get_seasons(self):
+        """Get the seasons in the store with how many episodes have been recorded and whether each one is finished."""
+        return pd.read_sql_query(
+            "SELECT season, episode, finished FROM seasons ORDER BY season",
+            self.connection,
+            index_col="season",
+        )
+
+    def is_current(self, season, build_key):
+        """Was the season last recorded from the build with this key? See `commish.cache.season_key`."""
+        row = self.connection.execute(
+            "SELECT build_key FROM seasons WHERE season = ?", (str(season),)
+        ).fetchone()
+        return row is not None and row[0] == build_key
+
+    def record_season(self, league, build_key=None):
+        """Write the current scores for a league into the store.
+
+        If the season was last recorded with the same input files and its episodes are a prefix of the league's episodes, only the weeks added since then are written. Otherwise every row for the season is replaced.
+
+        Parameters
+        ----------
+        league : League
+            The league to record.
+        build_key : str, optional
+            The key of the build that produced the league, so cached builds can be checked with `is_current`.
+        """
+        season = str(league.season)
+        episode_hashes = ",".join(league.episode_hashes)
+        row = self.connection.execute(
+            "SELECT input_hash, episode_hashes FROM seasons WHERE season = ?",
+            (season,),
+        ).fetchone()
+
+        first_new_week = 0
+        if row is not None and row[0] == league.input_hash:
+            if row[1] == episode_hashes:
+                first_new_week = None
+            elif episode_hashes.startswith(row[1]):
+                first_new_week = len([h for h in row[1].split(",") if h]) + 1
+
+        scores = league.total_scores()
+        place = scores["total_score"].rank(method="min", ascending=False)
+        totals = [
+            (season, name, int(p), int(perf), int(rank), int(total))
+            for name, p, perf, rank, total in zip(
+                scores.index,
+                place,
+                scores["total_performance_score"],
+                scores["total_rank_score"],
+                scores["total_score"],
+            )
+        ]
+
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO seasons VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    season,
+                    league.episode_number,
+                    int(league.cast.num_remaining_queens() == 0),
+                    league.input_hash,
+                    episode_hashes,
+                    build_key,
+                    time.time(),
+                ),
+            )
+            if first_new_week is None:
+                return
+
+            if first_new_week == 0:
+                for table in ["total_scores", "weekly_scores", "rankings"]:
+                    self.connection.execute(
+                        f"DELETE FROM {table} WHERE season = ?", (season,)
+                    )
+            else:
+                # A returning queen can change old ranks, so only the weekly scores are kept
+                for table in ["total_scores", "rankings"]:
+                    self.connection.execute(
+                        f"DELETE FROM {table} WHERE season = ?", (season,)
+                    )
+            self.connection.executemany(
+                "INSERT INTO total_scores VALUES (?, ?, ?, ?, ?, ?)", totals
+            )
+            self.connection.executemany(
+                "INSERT INTO weekly_scores VALUES (?, ?, ?, ?)",
+                self._get_weekly_rows(league, season, first_new_week),
+            )
+            self.connection.executemany(
+                "INSERT INTO rankings VALUES (?, ?, ?, ?, ?)",
+                self._get_ranking_rows(league, season),
+            )
+
+    @staticmethod
+    def _get_weekly_rows(league, season, first_week):
+        """Get a row for each contestant and week from `first_week` on."""
+        weekly_scores = league.get_weekly_scores()
+        weekly_scores = weekly_scores.loc[:, weekly_scores.columns >= first_week]
+        return [
+            (season, name, int(week), int(score))
+            for name, row in weekly_scores.iterrows()
+            for week, score in row.items()
+        ]
+
+    @staticmethod
+    def _get_ranking_rows(league, season):
+        """Get a row for each queen each contestant ranked, with where they ranked her and where she actually placed."""
+        rankings = league.contestants.get_rankings()
+        queen_names = league.cast.get_queen_names()
+        actual_ranks = league.cast.get_ranks().values
+        predicted = np.arange(1, rankings.shape[1] + 1)
+        return [
+            (
+                season,
+                name,
+                queen_names[queen],
+                int(predicted_rank),
+                int(actual_ranks[queen]),
+            )
+            for name, ranking in zip(league.contestants.names, rankings)
+            for queen, predicted_rank in zip(ranking, predicted)
+        ]
+
+    def get_leaderboard(self):
+        """Get the all-time leaderboard across every season in the store.
+
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame where the index is the contestant's name, sorted by all-time points, and the columns are 'seasons' (how many seasons they played), 'wins' (how many finished seasons they came first in, counting ties, so leading a season that is still going doesn't count), 'total_score' (all-time points), 'average_place' and 'average_rank_error' (how many places off their ranking of each queen was on average, counting only queens who have been eliminated).
+        """
+        return pd.read_sql_query(
+            """
+            SELECT t.contestant,
+                   COUNT(*) AS seasons,
+                   SUM(t.place = 1 AND s.finished) AS wins,
+                   SUM(t.total_score) AS total_score,
+                   AVG(t.place) AS average_place,
+                   (SELECT AVG(ABS(r.predicted_rank - r.actual_rank)) FROM rankings r
+                    WHERE r.contestant = t.contestant AND r.actual_rank > 0) AS average_rank_error
+            FROM total_scores t
+            JOIN seasons s ON s.season = t.season
+            GROUP BY t.contestant
+            ORDER BY total_score DESC, t.contestant
+            """,
+            self.connection,
+            index_col="contestant",
+        )
+
+    def get_player_history(self, contestant):
+        """Get how a contestant did in every season they played.
+
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame where the index is the season and the columns are 'place', 'total_performance_score', 'total_rank_score', 'total_score' and 'average_rank_error' (see `get_leaderboard`).
+        """
+        return pd.read_sql_query(
+            """
+            SELECT t.season, t.place, t.total_performance_score, t.total_rank_score, t.total_score,
+                   (SELECT AVG(ABS(r.predicted_rank - r.actual_rank)) FROM rankings r
+                    WHERE r.season = t.season AND r.contestant = t.contestant AND r.actual_rank > 0) AS average_rank_error
+            FROM total_scores t
+            WHERE t.contestant = ?
+            ORDER BY t.season
+            """,
+            self.connection,
+            params=(contestant,),
+            index_col="season",
+        )
+
+    def get_weekly_history(self, contestant):
+        """Get a contestant's performance score for every week of every season they played.
+
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame with columns 'season', 'week' and 'score'.
+        """
+        return pd.read_sql_query(
+            "SELECT season, week, score FROM weekly_scores WHERE contestant = ? ORDER BY season, week",
+            self.connection,
+            params=(contestant,),
+        )
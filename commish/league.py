@@ -1,12 +1,20 @@
 import os
-import itertools
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
 
 from .cast import Cast
 from .contestant import Contestants
 from .episode import Episode
+from .events import EventLog
 from .rules import Rules
+from .scenario import Scenario
+from .cache import file_hash
+from . import profiling
+
+# Bump this whenever the layout of the snapshot file changes
+SNAPSHOT_VERSION = 2
 
 
 # The League class manages the overall fantasy league, including contestants, cast, episodes, and rules.
@@ -31,6 +39,8 @@ class League:
         The multiplier applied to the captain's score (default is 2).
     team_size : int, optional
         The number of queens on each contestant's team (including the captain). Default is 3.
+    verify : bool, optional
+        If True, check the running score totals against a full recompute from the event history after every episode. This is slow and meant for debugging. Default is False.
 
     Attributes
     ----------
@@ -44,6 +54,26 @@ class League:
         How scoring is calculated for this league.
     contestants : Contestants
         The contestants playing in this fantasy league.
+    team_weights : pd.DataFrame
+        How much each queen's performance counts towards each contestant's score, indexed by contestant name with one column per queen.
+    team_values : np.ndarray
+        The contestants x queens matrix of how much each queen's rank is worth to each contestant, with contestants in file order and queens in cast order.
+    queen_rank_values : np.ndarray
+        How much each rank is worth to a queen, indexed by rank.
+    weeks : list of int
+        The weeks that have at least one performance event, in the order they were added.
+    performance_scores : np.ndarray
+        The running queens x weeks matrix of performance scores.
+    weekly_scores : np.ndarray
+        The running contestants x weeks matrix of team performance scores.
+    total_performance : np.ndarray
+        The running total performance score for each contestant.
+    verify : bool
+        Whether to check the running totals against a full recompute after every episode.
+    input_hash : str
+        A hash of the input files and scoring options, used to check that a snapshot belongs to this league.
+    episode_hashes : list of str
+        The hash of each episode file that has been added, in order.
     """
 
     def __init__(
@@ -55,72 +85,168 @@ class League:
         event_scores_file,
         captain_multiplier=2,
         team_size=3,
+        verify=False,
     ):
         # Attributes
         self.season = season
+        self.input_hash = self._get_input_hash(
+            [queens_file, contestant_file, rank_score_file, event_scores_file],
+            captain_multiplier,
+            team_size,
+        )
+        self.episode_hashes = []
         self.episode_number = 0
         self.cast = Cast(queens_file)
         self.rules = Rules(rank_score_file, event_scores_file, captain_multiplier)
         self.contestants = Contestants(
-            contestant_file, n_queens=len(self.cast.get_queens()), team_size=team_size
+            contestant_file,
+            self.cast.get_registry(),
+            team_size=team_size,
+        )
+        # Teams never change during a season, so the slot weights only need to be built once
+        self.team_weights = self._get_team_weights()
+        # Same for how much each queen's rank is worth to each contestant
+        queen_names = self.cast.get_queen_names()
+        self.team_values = self._get_team_values()
+        self.queen_rank_values = self.rules.get_rank_values("queen", len(queen_names))
+        # The rank scores table lists queens alphabetically
+        self._rank_score_order = np.argsort(queen_names.values, kind="stable")
+
+        # Running totals, updated each time an episode is added
+        self.verify = verify
+        self.weeks = []
+        self.performance_scores = np.zeros(
+            (len(self.team_weights.columns), 0), dtype=int
         )
+        self.weekly_scores = np.zeros((len(self.team_weights), 0), dtype=int)
+        self.total_performance = np.zeros(len(self.team_weights), dtype=int)
+
+    @staticmethod
+    def _get_input_hash(input_files, captain_multiplier, team_size):
+        """Hash everything that determines the league's state besides the episodes."""
+        h = hashlib.sha256(
+            f"{SNAPSHOT_VERSION}:{captain_multiplier}:{team_size}".encode()
+        )
+        for path in input_files:
+            h.update(file_hash(path).encode())
+        return h.hexdigest()
 
     def _get_queen_rank_scores(self):
-        """What is the current rank score for each queen in the cast?"""
-        ranks = self.cast.get_ranks().to_frame()
-        ranks = ranks.join(self.rules.get_rank_scores(kind="queen"), on="rank").fillna(
-            0
-        )
-        scores = ranks["score"].rename("queen_rank_score").astype(int)
-        return scores
+        """What is the current rank score for each queen in the cast, in cast order?"""
+        return self.queen_rank_values[self.cast.get_ranks().values]
 
-    def _get_contestants_rank_scores(self):
-        """How much is each queen worth for each contestant based on their rankings?"""
-        contestants = self.contestants.get_contestants()
-        queen_rankings = contestants["contestant"].apply(
-            lambda c: c.get_queen_rankings()
+    def _get_team_values(self):
+        """How much is each queen worth for each contestant based on their rankings?
+
+        Returns
+        -------
+        np.ndarray
+            A contestants x queens matrix, with contestants in the order of the contestants file and queens in cast order. Queens a contestant did not rank are worth 0.
+        """
+        rankings = self.contestants.get_rankings()
+        team_rank_values = self.rules.get_rank_values("team", rankings.shape[1])
+        team_values = np.zeros(
+            (len(rankings), len(self.cast.get_queen_names())), dtype=int
         )
-        rank_scores = queen_rankings.apply(
-            lambda x: x.join(self.rules.get_rank_scores(kind="team"), on="rank")[
-                "score"
-            ]
+        rows = np.arange(len(rankings))[:, None]
+        team_values[rows, rankings] = team_rank_values[1 : rankings.shape[1] + 1]
+        return team_values
+
+    def _get_team_weights(self):
+        """How much does each queen's performance count towards each contestant's score?
+
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame where the index is the contestant's name and the columns are the queens' names, in cast order. The captain is weighted by the captain multiplier, the other team members by 1, and every other queen by 0.
+        """
+        queen_names = self.cast.get_queen_names()
+        contestant_names = self.contestants.names
+        team_size = self.contestants.team_size
+        # Sort by contestant name so the scores come out in the same order as the other tables
+        order = np.argsort(contestant_names.values, kind="stable")
+        teams = self.contestants.get_rankings()[order, :team_size]
+
+        weights = np.zeros((len(order), len(queen_names)), dtype=int)
+        rows = np.arange(len(order))[:, None]
+        weights[rows, teams] = 1
+        weights[rows[:, 0], teams[:, 0]] = self.rules.get_captain_multiplier()
+
+        weights = pd.DataFrame(
+            weights, index=contestant_names[order], columns=queen_names
         )
-        return rank_scores
+        return weights
 
     def _update_returning_queens(self, returning_queens):
-        """If any queens are returning, add them back to the cast and update the ranks of the other queens accordingly."""
+        """If any queens are returning, add them back to the cast and update the ranks of the other queens accordingly. Queens are given by id."""
         if len(returning_queens) > 0:
             assert len(returning_queens) == 1, (
                 "Multiple returning queens are not currently supported"
             )
-            q = returning_queens[0]
-            old_rank = self.cast.return_queen(q)
+            old_rank = self.cast.return_queen_id(returning_queens[0])
             # Other queens need to drop down to the appropriate rank
-            for q in self.cast.get_queens():
-                if q.get_rank() >= old_rank:
-                    q.rank += 1
+            if old_rank > 0:
+                self.cast.demote_queens(old_rank)
 
     def _eliminate_queens(self, queens, episode_number):
-        """Eliminate the given queens and calculate their ranks."""
+        """Eliminate the given queens and calculate their ranks. Queens are given by id."""
         if len(queens) > 0:
             # All queens eliminated in the same episode get the same rank
             rank = self.cast.num_remaining_queens() - len(queens) + 1
             for q in queens:
-                self.cast.eliminate_queen(q, episode_number, rank)
+                self.cast.eliminate_queen_id(q, episode_number, rank)
 
     def _apply_performance_events(self, performance_events, episode_number):
-        """Apply the given performance events to the appropriate queens."""
-        for event, queen in performance_events.itertuples(index=False):
-            self.cast.get_queen(queen).add_performance_event(event, episode_number)
+        """Apply the given performance events to the appropriate queens. `performance_events` is a pair of parallel arrays of events and queen ids. `episode_number` can also be an array with the week of each event."""
+        events, queen_ids = performance_events
+        self.cast.add_performance_events(queen_ids, events, episode_number)
+
+    def _accumulate_performance_scores(self, performances, episode_numbers):
+        """Add the performance events from one or more episodes to the running score totals in a single pass.
+
+        Parameters
+        ----------
+        performances : list of tuple
+            The performance events for each episode, as returned by `Episode.get_performance_ids`.
+        episode_numbers : list of int
+            The episode number of each entry in `performances`.
+        """
+        lengths = np.array([len(events) for events, _ in performances])
+        # Weeks without any events do not show up on the scoreboard
+        has_events = lengths > 0
+        if not has_events.any():
+            return
+
+        events = np.concatenate([events for events, _ in performances])
+        queen_ids = np.concatenate([ids for _, ids in performances])
+        values = (
+            self.rules.get_event_scores().reindex(events).fillna(0).astype(int).values
+        )
+        columns = (np.cumsum(has_events) - 1)[
+            np.repeat(np.arange(len(lengths)), lengths)
+        ]
+        queen_scores = np.zeros(
+            (len(self.cast.get_queen_names()), has_events.sum()), dtype=int
+        )
+        np.add.at(queen_scores, (queen_ids, columns), values)
+        team_scores = self.team_weights.values @ queen_scores
+
+        self.weeks.extend(np.asarray(episode_numbers)[has_events].tolist())
+        self.performance_scores = np.column_stack(
+            [self.performance_scores, queen_scores]
+        )
+        self.weekly_scores = np.column_stack([self.weekly_scores, team_scores])
+        self.total_performance += team_scores.sum(axis=1)
 
     def _apply_finale_data(self, finale_data, episode_number):
-        """Apply the finale data to the appropriate queens."""
+        """Apply the finale data to the appropriate queens. Queens are given by id."""
         winner, runners_up = finale_data
         for q in runners_up:
-            self.cast.eliminate_queen(q, episode_number, rank=2)
+            self.cast.eliminate_queen_id(q, episode_number, rank=2)
 
-        self.cast.eliminate_queen(winner, episode_number, rank=1)
+        self.cast.eliminate_queen_id(winner, episode_number, rank=1)
 
+    @profiling.timed("League.get_rank_scores")
     def get_rank_scores(self):
         """The rank score is calculated by multiplying the queen's rank score by the contestant's rank score for that queen.
 
@@ -129,11 +255,16 @@ class League:
         pd.DataFrame
             A DataFrame where the index is the contestant's name and the columns are the queens' names. The values are the rank scores for each queen for each contestant.
         """
-        queen_scores = self._get_queen_rank_scores()
-        contestant_scores = self._get_contestants_rank_scores()
-        rank_scores = contestant_scores * queen_scores
+        rank_scores = self.team_values * self._get_queen_rank_scores()
+        order = self._rank_score_order
+        rank_scores = pd.DataFrame(
+            rank_scores[:, order],
+            index=self.contestants.names,
+            columns=self.cast.get_queen_names()[order].rename("queen"),
+        )
         return rank_scores
 
+    @profiling.timed("League.get_performance_scores")
     def get_performance_scores(self):
         """The performance score is calculated by summing the event scores for each queen for each week.
 
@@ -142,25 +273,14 @@ class League:
         pd.DataFrame
             A DataFrame where the index is the queen's name and the columns are the week numbers. The values are the performance scores for each queen for each week.
         """
-        performances = self.cast.get_performances()
-        performance_scores = (
-            performances.join(self.rules.get_event_scores(), on="event")
-            .groupby(["queen", "week"])["value"]
-            .sum()
-            .rename("performance_score")
-            .reset_index()
-        )
-        performance_scores = (
-            performance_scores.pivot(
-                index="queen", columns="week", values="performance_score"
-            )
-            .fillna(0)
-            .astype(int)
-            # Backfill any queens not on the scoreboard
-            .reindex(self.cast.get_queens().index, fill_value=0)
+        performance_scores = pd.DataFrame(
+            self.performance_scores,
+            index=self.cast.get_queen_names(),
+            columns=pd.Index(self.weeks, name="week", dtype=int),
         )
         return performance_scores
 
+    @profiling.timed("League.get_weekly_scores")
     def get_weekly_scores(self):
         """Calculate the weekly performance scores for each contestant based on their team captain and other two team members. The captain's performance score is multiplied by the captain multiplier.
 
@@ -169,39 +289,14 @@ class League:
         pd.DataFrame
             A DataFrame where the index is the contestant's name and the columns are the week numbers. The values are the total performance scores for each contestant for each week.
         """
-        performance_scores = self.get_performance_scores()
-
-        # Make a local copy to avoid modifying the original data
-        contestant_data = self.contestants.get_contestants().copy()
-        contestant_data["team"] = self.contestants.get_teams()
-        contestant_data["team_scores"] = contestant_data["team"].apply(
-            lambda x: performance_scores.loc[x]
-        )
-        contestant_data["captain"] = contestant_data["contestant"].apply(
-            lambda c: c.get_captain()
-        )
-
-        # Anonymous inner function to get the weekly scores for each team
-        def get_row_scores(row):
-            scores = row["team_scores"]
-            scores.loc[row["captain"]] *= self.rules.get_captain_multiplier()
-            return scores.sum(axis=0).rename("performance_score").reset_index()
-
-        # Combine all contestant weekly scores into a single DataFrame
-        weekly_scores = pd.concat(
-            contestant_data.apply(get_row_scores, axis=1).tolist(),
-            keys=contestant_data.index,
-        ).reset_index()
-        # Pivot from long to wide format
-        weekly_scores = (
-            weekly_scores.pivot(
-                index="name", columns="week", values="performance_score"
-            )
-            .fillna(0)
-            .astype(int)
+        weekly_scores = pd.DataFrame(
+            self.weekly_scores,
+            index=self.team_weights.index,
+            columns=pd.Index(self.weeks, name="week", dtype=int),
         )
         return weekly_scores
 
+    @profiling.timed("League.total_performance_scores")
     def total_performance_scores(self):
         """Calculate the total performance scores for each contestant by summing their weekly scores.
 
@@ -210,10 +305,54 @@ class League:
         pd.Series
             A Series where the index is the contestant's name and the values are the total performance scores.
         """
-        weekly_scores = self.get_weekly_scores()
-        total_scores = weekly_scores.sum(axis=1).rename("total_performance_score")
+        total_scores = pd.Series(
+            self.total_performance,
+            index=self.team_weights.index,
+            name="total_performance_score",
+        )
         return total_scores
 
+    def recompute_performance_scores(self):
+        """Recompute the performance scores for each queen from the full event history, without using the running totals.
+
+        Returns
+        -------
+        pd.DataFrame
+            The same DataFrame as `get_performance_scores`.
+        """
+        events = self.cast.get_events()
+        values = events.get_event_values(self.rules.get_event_scores())
+        # Only weeks with at least one event get a column
+        weeks, week_index = np.unique(events.get_weeks(), return_inverse=True)
+
+        queen_names = self.cast.get_queen_names()
+        performance_scores = np.zeros((len(queen_names), len(weeks)), dtype=int)
+        np.add.at(performance_scores, (events.get_queen_ids(), week_index), values)
+        performance_scores = pd.DataFrame(
+            performance_scores,
+            index=queen_names,
+            columns=pd.Index(weeks.astype(int), name="week"),
+        )
+        return performance_scores
+
+    def verify_scores(self):
+        """Check that the running performance totals match a full recompute from the event history."""
+        performance_scores = self.recompute_performance_scores()
+        weekly_scores = self.team_weights.values @ performance_scores.values
+        assert list(performance_scores.columns) == self.weeks, (
+            f"Running weeks {self.weeks} do not match recomputed weeks {list(performance_scores.columns)}"
+        )
+        assert np.array_equal(performance_scores.values, self.performance_scores), (
+            "Running queen performance scores do not match the recomputed scores"
+        )
+        assert np.array_equal(weekly_scores, self.weekly_scores), (
+            "Running weekly scores do not match the recomputed scores"
+        )
+        assert np.array_equal(weekly_scores.sum(axis=1), self.total_performance), (
+            "Running total performance scores do not match the recomputed scores"
+        )
+
+    @profiling.timed("League.total_rank_scores")
     def total_rank_scores(self):
         """Calculate the total rank scores for each contestant by summing their weekly rank scores.
 
@@ -222,10 +361,14 @@ class League:
         pd.Series
             A Series where the index is the contestant's name and the values are the total rank scores.
         """
-        rank_scores = self.get_rank_scores()
-        total_scores = rank_scores.sum(axis=1).rename("total_rank_score")
+        total_scores = pd.Series(
+            self.team_values @ self._get_queen_rank_scores(),
+            index=self.contestants.names,
+            name="total_rank_score",
+        )
         return total_scores
 
+    @profiling.timed("League.total_scores")
     def total_scores(self):
         """Calculate the total scores for each contestant by summing their total performance and rank scores.
 
@@ -240,12 +383,13 @@ class League:
         scores["total_score"] = total_performance + total_rank
         return scores
 
+    @profiling.timed("League.add_episode")
     def add_episode(self, episode_file):
         """Add a new episode to the league and update the state accordingly.
 
         The episode is read in from the provided file. The state is updated with the following procedure:
         1. Eliminate any queens who were eliminated in this episode.
-        2. Update the performance events for each queen based on the episode's performance data.
+        2. Update the performance events for each queen based on the episode's performance data, and add them to the running score totals.
         3. If this is the finale episode, log the runner-up and winner.
 
         Parameters
@@ -254,16 +398,258 @@ class League:
             The path to the episode data file (JSON format).
         """
         # Make sure this is the right episode
-        episode = Episode(episode_file)
+        episode = Episode(episode_file, registry=self.cast.get_registry())
         episode_number = episode.get_episode_number()
         assert episode_number == self.episode_number + 1, (
             f"The next episode is {self.episode_number + 1}, but episode number {episode_number} was provided."
         )
         print(f"Adding episode {episode_number}...")
         self.episode_number = episode_number
-
-        self._update_returning_queens(episode.get_returning_queens())
-        self._eliminate_queens(episode.get_eliminated_queen(), episode_number)
-        self._apply_performance_events(episode.get_performance(), episode_number)
+        self.episode_hashes.append(file_hash(episode_file))
+
+        self._update_returning_queens(episode.get_returning_queen_ids())
+        self._eliminate_queens(episode.get_eliminated_queen_ids(), episode_number)
+        performance = episode.get_performance_ids()
+        profiling.count("episodes")
+        profiling.count("performance_events", len(performance[0]))
+        self._apply_performance_events(performance, episode_number)
+        self._accumulate_performance_scores([performance], [episode_number])
         if episode.is_finale():
-            self._apply_finale_data(episode.get_finale_data(), episode_number)
+            self._apply_finale_data(episode.get_finale_data_ids(), episode_number)
+
+        if self.verify:
+            self.verify_scores()
+
+    def branch(self):
+        """Start a what-if scenario from the league's current state. See `Scenario`.
+
+        Returns
+        -------
+        Scenario
+            A scenario that can have hypothetical eliminations, events and finale results applied to it without changing the league.
+        """
+        return Scenario(self)
+
+    def _read_episodes(self, episode_files, jobs=None):
+        """Read and check a batch of episode files, collecting every problem instead of stopping at the first one.
+
+        Returns
+        -------
+        list of tuple
+            The `Episode` and file hash for each file, in order.
+        """
+        registry = self.cast.get_registry()
+
+        def read(episode_file):
+            return Episode(episode_file, registry=registry), file_hash(episode_file)
+
+        errors = []
+        results = []
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(read, f) for f in episode_files]
+            for i, future in enumerate(futures):
+                try:
+                    results.append(future.result())
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    message = f"{type(e).__name__}: {e}"
+                    if isinstance(e, KeyError):
+                        message = f"missing field {e}"
+                    errors.append((i, message))
+                    results.append(None)
+
+        # The episodes have to continue on from the last one added, with no gaps or repeats
+        expected = self.episode_number + 1
+        after_finale = self.cast.num_remaining_queens() == 0
+        for i, result in enumerate(results):
+            if result is not None:
+                episode = result[0]
+                episode_number = episode.get_episode_number()
+                if episode_number != expected:
+                    errors.append(
+                        (
+                            i,
+                            f"expected episode {expected}, but the file is episode {episode_number}",
+                        )
+                    )
+                if after_finale:
+                    errors.append((i, "comes after the finale"))
+                after_finale = after_finale or episode.is_finale()
+            expected += 1
+
+        if len(errors) > 0:
+            # Sorted by position in the batch, so each file's problems are listed together and in episode order
+            errors = sorted(errors, key=lambda error: error[0])
+            raise ValueError(
+                f"Could not add {len(errors)} episode file(s):\n"
+                + "\n".join(f"{episode_files[i]}: {message}" for i, message in errors)
+            )
+        return results
+
+    @profiling.timed("League.add_episodes")
+    def add_episodes(self, episode_files, jobs=None):
+        """Add several episodes to the league at once.
+
+        All of the files are read and checked on a thread pool before any of them are applied. If any file cannot be read, names a queen who is not in the cast, or is out of order, a `ValueError` listing every problem is raised. If applying one of the episodes fails, the league is put back the way it was before the call and the error is raised again, so either every episode is added or none are. Otherwise the eliminations are applied episode by episode, and the performance events from every episode are added to the running totals in a single pass. The end result is the same as calling `add_episode` on each file in order.
+
+        Parameters
+        ----------
+        episode_files : list of str
+            The paths to the episode data files (JSON format), in episode order. The first one must be the episode after the last one added.
+        jobs : int, optional
+            The number of threads used to read the files. Default is chosen by `ThreadPoolExecutor`.
+        """
+        if len(episode_files) == 0:
+            return
+        results = self._read_episodes(episode_files, jobs=jobs)
+        first = self.episode_number + 1
+        print(f"Adding episodes {first} to {first + len(results) - 1}...")
+
+        state = self._get_state()
+        try:
+            self._apply_episodes(results)
+        except Exception:
+            self._set_state(state)
+            raise
+
+        if self.verify:
+            self.verify_scores()
+
+    def _apply_episodes(self, results):
+        """Apply a batch of episodes read by `_read_episodes` to the league."""
+        performances = []
+        episode_numbers = []
+        for episode, episode_hash in results:
+            episode_number = episode.get_episode_number()
+            self.episode_number = episode_number
+            self.episode_hashes.append(episode_hash)
+
+            self._update_returning_queens(episode.get_returning_queen_ids())
+            self._eliminate_queens(episode.get_eliminated_queen_ids(), episode_number)
+            if episode.is_finale():
+                self._apply_finale_data(episode.get_finale_data_ids(), episode_number)
+            performances.append(episode.get_performance_ids())
+            episode_numbers.append(episode_number)
+
+        # The event log and the running totals are updated once for the whole batch
+        lengths = [len(events) for events, _ in performances]
+        weeks = np.repeat(episode_numbers, lengths)
+        events = np.concatenate([events for events, _ in performances])
+        queen_ids = np.concatenate([ids for _, ids in performances])
+        self._apply_performance_events((events, queen_ids), weeks)
+        self._accumulate_performance_scores(performances, episode_numbers)
+        profiling.count("episodes", len(results))
+        profiling.count("performance_events", len(events))
+
+    def _get_state(self):
+        """Copy everything adding episodes changes, so it can be put back with `_set_state`."""
+        return {
+            "episode_number": self.episode_number,
+            "episode_hashes": list(self.episode_hashes),
+            "rank": self.cast.rank.copy(),
+            "week_eliminated": self.cast.week_eliminated.copy(),
+            "eliminated": self.cast.eliminated.copy(),
+            "n_remaining": self.cast.n_remaining,
+            # Only the end of the log is ever written to, so the filled-in part doesn't need to be copied here
+            "events": self.cast.get_events().get_arrays(),
+            "weeks": list(self.weeks),
+            "performance_scores": self.performance_scores.copy(),
+            "weekly_scores": self.weekly_scores.copy(),
+            "total_performance": self.total_performance.copy(),
+        }
+
+    def _set_state(self, state):
+        """Put back the state copied by `_get_state`."""
+        self.episode_number = state["episode_number"]
+        self.episode_hashes = state["episode_hashes"]
+        self.cast.rank[:] = state["rank"]
+        self.cast.week_eliminated[:] = state["week_eliminated"]
+        self.cast.eliminated[:] = state["eliminated"]
+        self.cast.n_remaining = state["n_remaining"]
+        self.cast.events = EventLog.from_arrays(state["events"])
+        self.weeks = state["weeks"]
+        self.performance_scores = state["performance_scores"]
+        self.weekly_scores = state["weekly_scores"]
+        self.total_performance = state["total_performance"]
+
+    def save_snapshot(self, snapshot_file):
+        """Save the state of the league to a compressed NumPy archive so it can be resumed later.
+
+        The snapshot contains the cast state, the log of performance events, the running score totals, and the hashes of the input and episode files.
+
+        Parameters
+        ----------
+        snapshot_file : str
+            The path to write the snapshot to. Should end in `.npz`.
+        """
+        events = {
+            f"event_{name}": array
+            for name, array in self.cast.get_events().get_arrays().items()
+        }
+        os.makedirs(os.path.dirname(snapshot_file) or ".", exist_ok=True)
+        with open(snapshot_file, "wb") as f:
+            np.savez_compressed(
+                f,
+                input_hash=np.array(self.input_hash),
+                episode_hashes=np.array(self.episode_hashes, dtype=str),
+                episode_number=np.array(self.episode_number),
+                rank=self.cast.rank,
+                week_eliminated=self.cast.week_eliminated,
+                eliminated=self.cast.eliminated,
+                **events,
+                weeks=np.array(self.weeks, dtype=int),
+                performance_scores=self.performance_scores,
+                weekly_scores=self.weekly_scores,
+                total_performance=self.total_performance,
+            )
+
+    def load_snapshot(self, snapshot_file, episode_files=None):
+        """Restore the state of the league from a snapshot made by `save_snapshot`.
+
+        The snapshot is only loaded if it was made from the same input files and scoring options as this league, and if every episode it contains still matches the corresponding file in `episode_files`. Otherwise the league is left unchanged.
+
+        Parameters
+        ----------
+        snapshot_file : str
+            The path to the snapshot.
+        episode_files : list of str, optional
+            The episode files for the season, in order. If provided, the snapshot is rejected when any episode it contains has been changed or removed since it was made.
+
+        Returns
+        -------
+        bool
+            Whether the snapshot was loaded.
+        """
+        assert self.episode_number == 0, (
+            "Snapshots can only be loaded into a league with no episodes"
+        )
+        with np.load(snapshot_file, allow_pickle=False) as snapshot:
+            snapshot = dict(snapshot)
+
+        if str(snapshot["input_hash"]) != self.input_hash:
+            return False
+        episode_hashes = snapshot["episode_hashes"].tolist()
+        if episode_files is not None:
+            if len(episode_files) < len(episode_hashes):
+                return False
+            for path, h in zip(episode_files, episode_hashes):
+                if file_hash(path) != h:
+                    return False
+
+        self.episode_number = int(snapshot["episode_number"])
+        self.episode_hashes = episode_hashes
+        self.cast.rank[:] = snapshot["rank"]
+        self.cast.week_eliminated[:] = snapshot["week_eliminated"]
+        self.cast.eliminated[:] = snapshot["eliminated"]
+        self.cast.n_remaining = int((~self.cast.eliminated).sum())
+        self.cast.events = EventLog.from_arrays(
+            {
+                name[len("event_") :]: array
+                for name, array in snapshot.items()
+                if name.startswith("event_")
+            }
+        )
+        self.weeks = snapshot["weeks"].tolist()
+        self.performance_scores = snapshot["performance_scores"]
+        self.weekly_scores = snapshot["weekly_scores"]
+        self.total_performance = snapshot["total_performance"]
+        return True
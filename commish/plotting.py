@@ -1,13 +1,130 @@
+import weakref
+import functools
+import contextlib
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg, RendererAgg
+from matplotlib.font_manager import FontProperties
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 import numpy as np
 
+from . import profiling
+from .constants import MAX_ANNOTATED_CELLS
+
+# The subplot layout each figure starts with, which `Figure.tight_layout` changes
+SUBPLOT_PARAMS = ["left", "right", "bottom", "top", "wspace", "hspace"]
+
+
+class FigurePool:
+    """Hands out figures for drawing plots and takes them back once they are saved, so figures and their canvases are reused instead of being made from scratch for every plot.
+
+    Figures from the pool are not registered with pyplot, so a figure that is never given back is freed like any other object instead of being kept alive by pyplot. A figure that is given back is cleared and reset to the defaults from `matplotlib.rcParams` before it is handed out again, so plots drawn on a reused figure are identical to ones drawn on a new figure.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        The most figures kept for reuse at once. Extra figures given back are dropped.
+    """
+
+    def __init__(self, max_size=4):
+        self.max_size = max_size
+        self._free = []
+        self._figures = weakref.WeakSet()
+
+    def get_figure(self, figsize=None, dpi=None):
+        """Get a blank figure from the pool, or a new one if the pool is empty.
+
+        Parameters
+        ----------
+        figsize : tuple of float, optional
+            The width and height of the figure in inches. Default is `rcParams["figure.figsize"]`.
+        dpi : float, optional
+            The resolution of the figure. Default is `rcParams["figure.dpi"]`.
+
+        Returns
+        -------
+        matplotlib.figure.Figure
+            The figure, with no axes.
+        """
+        if figsize is None:
+            figsize = plt.rcParams["figure.figsize"]
+        if dpi is None:
+            dpi = plt.rcParams["figure.dpi"]
+        if len(self._free) == 0:
+            fig = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(fig)
+            self._figures.add(fig)
+            return fig
+
+        fig = self._free.pop()
+        fig.set_dpi(dpi)
+        fig.set_size_inches(figsize, forward=False)
+        fig.subplotpars.update(
+            **{k: plt.rcParams[f"figure.subplot.{k}"] for k in SUBPLOT_PARAMS}
+        )
+        return fig
+
+    def release(self, fig):
+        """Give a figure back to the pool once it is no longer needed. Figures that did not come from the pool are closed with pyplot instead."""
+        if fig not in self._figures:
+            plt.close(fig)
+            return
+        fig.clear()
+        if len(self._free) < self.max_size and fig not in self._free:
+            self._free.append(fig)
+
+    def clear(self):
+        """Drop every figure kept for reuse."""
+        self._free.clear()
+
+
+_figure_pool = FigurePool()
+# How many `use_figure_pool` blocks are open. The pool is only used inside one.
+_pool_depth = 0
+
+
+def get_figure_pool():
+    """Get the figure pool the plotting functions draw on inside `use_figure_pool`."""
+    return _figure_pool
+
+
+@contextlib.contextmanager
+def use_figure_pool():
+    """Draw the plots on figures from the figure pool inside the block, for code that only saves them to files, like `commish.build.make_plots`.
+
+    Outside the block the plotting functions make their figures with pyplot, so `plt.show()` and `plt.gcf()` work on them as usual. Figures drawn inside the block are not registered with pyplot and should be given back with `save_figure` or `release_figure`.
+    """
+    global _pool_depth
+    _pool_depth += 1
+    try:
+        yield _figure_pool
+    finally:
+        _pool_depth -= 1
+
+
+def _new_figure(figsize=None, dpi=None):
+    """Get a blank figure to draw a plot on, from the figure pool inside `use_figure_pool` or from pyplot otherwise."""
+    if _pool_depth > 0:
+        return _figure_pool.get_figure(figsize=figsize, dpi=dpi)
+    return plt.figure(figsize=figsize, dpi=dpi)
+
+
+def release_figure(fig):
+    """Give a figure from one of the plotting functions back to be reused. The figure should not be used afterwards."""
+    _figure_pool.release(fig)
+
 
 def plot_total_scores(league, color=None, horizontal=True):
     """Plot total scores for each contestant as a bar chart."""
-    scores = league.total_scores()
-    fig, ax = plt.subplots()
+    return draw_total_scores(league.total_scores(), color=color, horizontal=horizontal)
+
+
+@profiling.timed("plotting.draw_total_scores")
+def draw_total_scores(scores, color=None, horizontal=True):
+    """Draw the bar chart of total scores from the DataFrame returned by `League.total_scores`."""
+    fig = _new_figure()
+    ax = fig.subplots()
     if horizontal:
         scores = scores.sort_values("total_score", ascending=True)
         bars = ax.barh(scores.index, scores["total_score"], color=color)
@@ -44,9 +161,17 @@ def plot_total_scores(league, color=None, horizontal=True):
 
 def plot_total_scores_split(league, colors=None, horizontal=True):
     """Plot total scores split into rank and performance scores as a stacked bar chart."""
+    return draw_total_scores_split(
+        league.total_scores(), colors=colors, horizontal=horizontal
+    )
+
+
+@profiling.timed("plotting.draw_total_scores_split")
+def draw_total_scores_split(scores, colors=None, horizontal=True):
+    """Draw the stacked bar chart of total scores from the DataFrame returned by `League.total_scores`."""
     assert len(colors) == 2
-    scores = league.total_scores()
-    fig, ax = plt.subplots()
+    fig = _new_figure()
+    ax = fig.subplots()
     if horizontal:
         scores = scores.sort_values("total_score", ascending=True)
         bars1 = ax.barh(
@@ -108,19 +233,36 @@ def plot_total_scores_split(league, colors=None, horizontal=True):
 
 def plot_weekly_scores(league, **format_kwargs):
     """Plot the weekly performance scores for each contestant's team as a heatmap with total scores as a bar plot on the right."""
-    scores = league.get_weekly_scores()
-    fig, ax_list = heatmap_bar_biplot(scores, **format_kwargs)
+    return draw_weekly_scores(league.get_weekly_scores(), **format_kwargs)
+
+
+@profiling.timed("plotting.draw_weekly_scores")
+def draw_weekly_scores(weekly_scores, **format_kwargs):
+    """Draw the weekly scores heatmap from the DataFrame returned by `League.get_weekly_scores`."""
+    fig, ax_list = heatmap_bar_biplot(weekly_scores, **format_kwargs)
     return fig
 
 
 def plot_rank_scores(league, cmap="plasma", low_is_light=False):
     """Plot the rank scores each queen contributes to each team. Queens are ordered by their rank in the season. Queens who are still in the competition are at the bottom."""
-    scores = league.get_rank_scores().T
-    ranks = league.cast.get_ranks()
+    return draw_rank_scores(
+        league.get_rank_scores(),
+        league.cast.get_ranks(),
+        cmap=cmap,
+        low_is_light=low_is_light,
+    )
+
+
+@profiling.timed("plotting.draw_rank_scores")
+def draw_rank_scores(rank_scores, ranks, cmap="plasma", low_is_light=False):
+    """Draw the rank scores heatmap from the DataFrame returned by `League.get_rank_scores` and the Series returned by `Cast.get_ranks`."""
+    scores = rank_scores.T
+    ranks = ranks.copy()
     ranks[ranks == 0] = max(ranks) + 1  # So that unranked go to bottom
     ranks = ranks.sort_values()
     scores = scores.loc[ranks.index]
-    fig, ax = plt.subplots()
+    fig = _new_figure()
+    ax = fig.subplots()
     ax.imshow(scores, aspect="equal", cmap=cmap)
     ax.set_xticks(range(len(scores.columns)))
     ax.set_xticklabels(scores.columns, rotation=90, ha="center", va="top")
@@ -132,8 +274,13 @@ def plot_rank_scores(league, cmap="plasma", low_is_light=False):
 
 def plot_performance_scores(league, **format_kwargs):
     """Plot weekly performance scores for each queen (before the captain multiplier) as a heatmap with total scores as a bar plot on the right."""
-    scores = league.get_performance_scores()
-    fig, ax_list = heatmap_bar_biplot(scores, **format_kwargs)
+    return draw_performance_scores(league.get_performance_scores(), **format_kwargs)
+
+
+@profiling.timed("plotting.draw_performance_scores")
+def draw_performance_scores(performance_scores, **format_kwargs):
+    """Draw the queen performance scores heatmap from the DataFrame returned by `League.get_performance_scores`."""
+    fig, ax_list = heatmap_bar_biplot(performance_scores, **format_kwargs)
     return fig
 
 
@@ -147,6 +294,7 @@ def heatmap_bar_biplot(
     panel_gap=0.08,
     vpad=0.5,
     fig_dpi=plt.rcParams["figure.dpi"],
+    max_annotated_cells=MAX_ANNOTATED_CELLS,
 ):
     """Create a heatmap of scores with a bar plot of total scores to the right.
 
@@ -168,6 +316,8 @@ def heatmap_bar_biplot(
         Gap between the heatmap and bar plot in inches.
     vpad : float, optional
         Vertical padding above and below the heatmap in inches.
+    max_annotated_cells : int, optional
+        Only label each cell with its value if the heatmap has at most this many cells.
 
     Returns
     -------
@@ -180,31 +330,27 @@ def heatmap_bar_biplot(
     totals = scores.sum(axis=1).sort_values()
     scores = scores.loc[totals.index[::-1]]
 
-    # Figure out dimensions with a temporary heatmap
+    # Figure out dimensions from the widest y-tick label
     nrow, ncol = scores.shape
-    tmp_fig, tmp_ax = plt.subplots(figsize=(4, 4))
-
-    tmp_ax.imshow(scores, aspect="equal")
-    tmp_ax.set_yticks(range(nrow), labels=scores.index)
-
-    tmp_fig.canvas.draw()
-    renderer = tmp_fig.canvas.get_renderer()
-
     max_label_width_px = max(
-        label.get_window_extent(renderer).width
-        for label in tmp_ax.get_yticklabels()
-        if label.get_text()
+        (
+            measure_text_width(
+                str(label), plt.rcParams["ytick.labelsize"], plt.rcParams["figure.dpi"]
+            )
+            for label in scores.index
+            if str(label)
+        ),
+        default=0,
     )
 
-    plt.close(tmp_fig)
-
     ytick_space_in = max_label_width_px / fig_dpi + 0.2
     heatmap_width = ncol * pixel_size
     total_width = ytick_space_in + heatmap_width + panel_gap + barplot_width
     total_height = nrow * pixel_size + 2 * vpad
 
     # Draw the real heatmap
-    fig, ax_hm = plt.subplots(figsize=(total_width, total_height), dpi=fig_dpi)
+    fig = _new_figure(figsize=(total_width, total_height), dpi=fig_dpi)
+    ax_hm = fig.subplots()
     heatmap = ax_hm.imshow(
         scores,
         aspect="equal",
@@ -215,7 +361,7 @@ def heatmap_bar_biplot(
     ax_hm.set_xlabel("Episode")
     ax_hm.set_xticks(range(len(scores.columns)), labels=scores.columns)
     ax_hm.set_yticks(range(len(scores.index)), labels=scores.index)
-    annotate_heatmap(ax_hm, scores)
+    annotate_heatmap(ax_hm, scores, max_cells=max_annotated_cells)
 
     # Barplot
     ax_bar = add_axes(ax_hm, "right", size=barplot_width, pad=panel_gap)
@@ -235,25 +381,62 @@ def heatmap_bar_biplot(
     return fig, (ax_hm, ax_bar)
 
 
-def annotate_heatmap(ax, data, low_is_light=True):
-    """Annotate each cell on the heatmap with the underlying value"""
+def annotate_heatmap(ax, data, low_is_light=True, max_cells=MAX_ANNOTATED_CELLS):
+    """Annotate each cell on the heatmap with the underlying value. Heatmaps with more than `max_cells` cells are left unannotated."""
+    if data.size > max_cells:
+        return ax
     if low_is_light:
         low, high = "black", "white"
     else:
         low, high = "white", "black"
-    for i in range(data.shape[0]):
-        for j in range(data.shape[1]):
-            ax.text(
-                j,
-                i,
-                f"{data.iloc[i, j]}",
-                ha="center",
-                va="center",
-                color=low if abs(data.iloc[i, j]) < (data.values.max() / 2) else high,
-            )
+
+    values = np.asarray(data.values)
+    colors = np.where(np.abs(values) < (values.max() / 2), low, high)
+    for (i, j), value, color in zip(
+        np.ndindex(values.shape), values.ravel(), colors.ravel()
+    ):
+        ax.text(j, i, f"{value}", ha="center", va="center", color=color)
     return ax
 
 
+@functools.lru_cache(maxsize=None)
+def _get_measuring_renderer(dpi):
+    """A renderer that is only used to measure text, one per dpi."""
+    return RendererAgg(1, 1, dpi)
+
+
+@functools.lru_cache(maxsize=4096)
+def measure_text_width(text, fontsize, dpi):
+    """Measure how wide a single line of text is when drawn, in pixels.
+
+    Parameters
+    ----------
+    text : str
+        The text to measure.
+    fontsize : float or str
+        The font size, in points or as a relative size like "medium".
+    dpi : float
+        The resolution of the figure the text will be drawn on.
+
+    Returns
+    -------
+    float
+        The width of the text in pixels.
+    """
+    renderer = _get_measuring_renderer(dpi)
+    width, _, _ = renderer.get_text_width_height_descent(
+        text, FontProperties(size=fontsize), ismath=False
+    )
+    return width
+
+
+@profiling.timed("plotting.save_figure")
+def save_figure(fig, path):
+    """Save a figure to a file and give it back to be reused, or close it to free its memory if it did not come from the figure pool."""
+    fig.savefig(path)
+    release_figure(fig)
+
+
 def set_xticks_above(ax):
     """Set x-axis ticks above the plot."""
     ax.xaxis.set_ticks_position("top")
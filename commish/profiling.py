@@ -0,0 +1,192 @@
+import sys
+import json
+import time
+import functools
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Profiling is off unless `enable` is called. Every hook checks this flag first and does nothing else when it is off.
+_enabled = False
+# Maps each stage name to a dict with its number of calls, total seconds and peak memory
+_stages = {}
+# Maps each counter name to its value
+_counters = {}
+# Stages that are currently running, innermost last. Each entry is [memory at start, highest memory seen].
+_stack = []
+
+
+def enable(trace_memory=True):
+    """Turn on the profiling hooks and clear anything recorded before.
+
+    Parameters
+    ----------
+    trace_memory : bool, optional
+        Also record the peak memory allocated by Python during each stage, using `tracemalloc`. This slows the code down noticeably, so the timings are less accurate with it on.
+    """
+    global _enabled
+    reset()
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _enabled = True
+
+
+def disable():
+    """Turn off the profiling hooks. What was recorded is kept until the next `reset` or `enable`."""
+    global _enabled
+    _enabled = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def is_enabled():
+    """Are the profiling hooks turned on?"""
+    return _enabled
+
+
+def reset():
+    """Clear every recorded stage and counter."""
+    _stages.clear()
+    _counters.clear()
+    _stack.clear()
+
+
+def count(name, n=1):
+    """Add `n` to a counter. Does nothing when profiling is off."""
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def _start_stage():
+    """Start tracking memory for a new stage, returning when it started."""
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        # Stages that are already running need to see the peak before it is reset
+        for frame in _stack:
+            frame[1] = max(frame[1], peak)
+        tracemalloc.reset_peak()
+        _stack.append([current, current])
+    return time.perf_counter()
+
+
+def _end_stage(name, start):
+    """Record the time and peak memory of a stage that has just finished."""
+    elapsed = time.perf_counter() - start
+    stage = _stages.setdefault(name, {"calls": 0, "seconds": 0.0, "peak_bytes": 0})
+    stage["calls"] += 1
+    stage["seconds"] += elapsed
+    if tracemalloc.is_tracing() and len(_stack) > 0:
+        _, peak = tracemalloc.get_traced_memory()
+        frame = _stack.pop()
+        frame[1] = max(frame[1], peak)
+        stage["peak_bytes"] = max(stage["peak_bytes"], frame[1] - frame[0])
+        if len(_stack) > 0:
+            _stack[-1][1] = max(_stack[-1][1], frame[1])
+
+
+class _Stage:
+    """Context manager that records the time and memory of everything inside it as one call to a stage."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = _start_stage()
+        return self
+
+    def __exit__(self, *exc_info):
+        _end_stage(self.name, self.start)
+        return False
+
+
+class _NullStage:
+    """Context manager that does nothing, used when profiling is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name):
+    """Time a block of code as a named stage.
+
+    Use it as `with profiling.stage("render"): ...`. When profiling is off, this returns a shared context manager that does nothing.
+    """
+    if _enabled:
+        return _Stage(name)
+    return _NULL_STAGE
+
+
+def timed(name):
+    """Decorator that times every call to a function as a named stage. When profiling is off, the function is called directly."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = _start_stage()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _end_stage(name, start)
+
+        return wrapper
+
+    return decorator
+
+
+def get_peak_rss():
+    """Get the peak resident memory of this process in bytes, or None if it is not available on this platform."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def get_report():
+    """Get everything recorded so far.
+
+    Returns
+    -------
+    dict
+        A dict with 'stages' (maps each stage to its number of calls, total seconds and peak traced memory in bytes), 'counters' (maps each counter to its value) and 'peak_rss_bytes' (the peak resident memory of the process).
+    """
+    return {
+        "stages": {name: dict(stage) for name, stage in _stages.items()},
+        "counters": dict(_counters),
+        "peak_rss_bytes": get_peak_rss(),
+    }
+
+
+def format_report(report):
+    """Format a report from `get_report` as a plain-text table, with the slowest stages first."""
+    rows = sorted(report["stages"].items(), key=lambda item: -item[1]["seconds"])
+    width = max([len("stage")] + [len(name) for name, _ in rows])
+    lines = [f"{'stage':<{width}}  {'calls':>6}  {'seconds':>10}  {'peak MB':>9}"]
+    for name, stage in rows:
+        lines.append(
+            f"{name:<{width}}  {stage['calls']:>6}  {stage['seconds']:>10.4f}  {stage['peak_bytes'] / 2**20:>9.2f}"
+        )
+    for name, value in report["counters"].items():
+        lines.append(f"{name}: {value}")
+    if report["peak_rss_bytes"] is not None:
+        lines.append(f"peak resident memory: {report['peak_rss_bytes'] / 2**20:.1f} MB")
+    return "\n".join(lines)
+
+
+def write_report(path):
+    """Write the report from `get_report` to a JSON file and return it."""
+    report = get_report()
+    with open(path, "w") as f:
+        json.dump(report, f, indent=4)
+    return report
@@ -1,13 +1,18 @@
+import numpy as np
 import pandas as pd
 
 
 class Queen:
-    """The class for managing a queen on the cast in a season of RuPaul's Drag Race.
+    """The class for accessing a queen on the cast in a season of RuPaul's Drag Race.
+
+    A Queen is a thin view onto the arrays held by the Cast. It does not store any state of its own, so changes made through a Queen are visible to the Cast and vice versa.
 
     Parameters
     ----------
-    name : str
-        The name of the queen.
+    cast : Cast
+        The cast the queen belongs to.
+    queen_id : int
+        The integer id of the queen in the cast.
 
     Attributes
     ----------
@@ -18,14 +23,37 @@ class Queen:
     rank : int
         The rank of the queen in the competition (1 for winner, 2 for runner-up, etc.). 0 if still competing.
     performance_events : dict
-        A dictionary mapping week numbers to lists of performance events for that week.
+        A dictionary mapping week numbers to lists of performance events for that week. This is built from the cast's event log each time it is accessed.
     """
 
-    def __init__(self, name):
-        self.name = name
-        self.week_eliminated = None
-        self.rank = 0
-        self.performance_events = {}
+    def __init__(self, cast, queen_id):
+        self.cast = cast
+        self.queen_id = queen_id
+
+    @property
+    def name(self):
+        return self.cast.names[self.queen_id]
+
+    @property
+    def week_eliminated(self):
+        if not self.cast.eliminated[self.queen_id]:
+            return None
+        return int(self.cast.week_eliminated[self.queen_id])
+
+    @property
+    def rank(self):
+        return int(self.cast.rank[self.queen_id])
+
+    @rank.setter
+    def rank(self, value):
+        self.cast.rank[self.queen_id] = value
+
+    @property
+    def performance_events(self):
+        performance_events = {}
+        for week, event in self.get_performance_events().itertuples(index=False):
+            performance_events.setdefault(week, []).append(event)
+        return performance_events
 
     def get_name(self):
         """Get the name of the queen."""
@@ -37,7 +65,7 @@ class Queen:
 
     def is_eliminated(self):
         """Check if the queen has been eliminated."""
-        return self.week_eliminated is not None
+        return bool(self.cast.eliminated[self.queen_id])
 
     def get_rank(self):
         """Get the rank of the queen in the competition."""
@@ -45,26 +73,26 @@ class Queen:
 
     def get_performance_events(self):
         """Get all performance events for the queen as a DataFrame."""
-        events = []
-        for week, event_list in self.performance_events.items():
-            for e in event_list:
-                events.append((week, e))
-        events = pd.DataFrame(events, columns=["week", "event"])
+        log = self.cast.get_events()
+        mask = log.get_queen_ids() == self.queen_id
+        events = pd.DataFrame(
+            {
+                "week": log.get_weeks()[mask].astype(int),
+                "event": np.array(log.get_event_names(), dtype=object)[
+                    log.get_event_ids()[mask]
+                ],
+            }
+        )
         return events
 
     def eliminate(self, week, rank):
         """Eliminate the queen from the competition. Log the week and rank."""
-        self.week_eliminated = week
-        self.rank = rank
+        self.cast.eliminate_queen_id(self.queen_id, week, rank)
 
     def return_to_competition(self):
         """Return the queen to the competition. Reset elimination info."""
-        self.week_eliminated = None
-        self.rank = 0
+        self.cast.return_queen_id(self.queen_id)
 
     def add_performance_event(self, event, week):
         """Add a performance event for the queen in a specific week."""
-        if week in self.performance_events:
-            self.performance_events[week].append(event)
-        else:
-            self.performance_events[week] = [event]
+        self.cast.add_performance_events([self.queen_id], [event], week)
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+
+class QueenRegistry:
+    """Maps the name of each queen in a season to a dense integer id.
+
+    The registry is built once when the cast is loaded and shared by the Cast, Contestants and Episode, so names are only translated when data is read in. Everything after that works with the integer ids.
+
+    Parameters
+    ----------
+    names : list of str
+        The names of the queens in the cast. A queen's id is her position in this list.
+
+    Attributes
+    ----------
+    names : pd.Index
+        The names of the queens, in id order.
+    ids : dict
+        Maps each queen's name to her id.
+    """
+
+    def __init__(self, names):
+        self.names = pd.Index(names, name="name")
+        duplicates = self.names[self.names.duplicated()].unique().tolist()
+        if len(duplicates) > 0:
+            raise ValueError(f"Queens listed more than once in the cast: {duplicates}")
+        self.ids = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, queen_name):
+        return queen_name in self.ids
+
+    def get_names(self):
+        """Get the names of the queens, in id order."""
+        return self.names
+
+    def get_id(self, queen_name):
+        """Get the id of a single queen by name."""
+        assert queen_name in self.ids, f"Queen {queen_name} not found in cast"
+        return self.ids[queen_name]
+
+    def get_indexer(self, queen_names):
+        """Get the ids of many queens at once. Names that are not in the cast get -1."""
+        return self.names.get_indexer(queen_names)
+
+    def translate(self, queen_names, source):
+        """Get the ids of many queens at once, raising one error that lists every unknown name.
+
+        Parameters
+        ----------
+        queen_names : list of str
+            The names to translate.
+        source : str
+            Where the names came from, used in the error message.
+
+        Returns
+        -------
+        np.ndarray
+            The id of each queen.
+        """
+        queen_ids = self.get_indexer(queen_names)
+        if (queen_ids < 0).any():
+            unknown = list(
+                dict.fromkeys(np.asarray(queen_names)[queen_ids < 0].tolist())
+            )
+            raise ValueError(f"{source} has queens not in the cast: {unknown}")
+        return queen_ids
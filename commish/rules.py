@@ -1,5 +1,39 @@
+import os
+import numpy as np
 import pandas as pd
 
+# Parsed rules tables, keyed by absolute path and index column. Several seasons usually share the same rules files.
+_tables = {}
+
+
+def read_rules_table(path, index_col):
+    """Read a rules TSV, or reuse it if it has already been parsed in this process."""
+    key = (os.path.abspath(path), index_col)
+    if key not in _tables:
+        _tables[key] = pd.read_csv(path, sep="\t", index_col=index_col)
+    return _tables[key]
+
+
+def preload_rules_tables(tables):
+    """Add already-parsed rules tables to the cache, e.g. ones parsed by a parent process.
+
+    Parameters
+    ----------
+    tables : dict
+        Maps (absolute path, index column) to the parsed DataFrame, as returned by `get_rules_tables`.
+    """
+    _tables.update(tables)
+
+
+def clear_rules_tables():
+    """Forget every parsed rules table, so edited rules files are read again."""
+    _tables.clear()
+
+
+def get_rules_tables():
+    """Get every rules table parsed so far in this process."""
+    return dict(_tables)
+
 
 class Rules:
     """The class that defines the scoring rules for the league.
@@ -21,14 +55,28 @@ class Rules:
         A Series mapping event to score.
     captain_multiplier : int
         The multiplier applied to the captain's score.
+    rank_values : dict
+        Maps "team" and "queen" to a dense array where entry `r` is the value of rank `r`. Entry 0 (still competing) and ranks missing from the table are worth 0.
     """
 
     def __init__(self, rank_score_file, event_scores_file, captain_multiplier):
-        self.rank_scores = pd.read_csv(rank_score_file, sep="\t", index_col="rank")
-        self.event_scores = pd.read_csv(
-            event_scores_file, sep="\t", index_col="event"
+        self.rank_scores = read_rules_table(rank_score_file, index_col="rank")
+        self.event_scores = read_rules_table(
+            event_scores_file, index_col="event"
         ).squeeze()
         self.captain_multiplier = captain_multiplier
+        self.rank_values = {
+            kind: self._compile_rank_scores(self.get_rank_scores(kind=kind))
+            for kind in ["team", "queen"]
+        }
+
+    @staticmethod
+    def _compile_rank_scores(scores):
+        """Turn a column of the rank scores table into an array indexed by rank."""
+        values = np.zeros(max(scores.index.max(), 0) + 1, dtype=int)
+        values[scores.index.values] = scores.values
+        values[0] = 0
+        return values
 
     def get_captain_multiplier(self):
         """What is the captain multiplier?"""
@@ -45,6 +93,28 @@ class Rules:
         else:
             raise ValueError(f"Unknown kind: {kind}")
 
+    def get_rank_values(self, kind, n_ranks=0):
+        """How many points is each rank worth, as an array indexed by rank?
+
+        Parameters
+        ----------
+        kind : str
+            Either "team" or "queen", see `get_rank_scores`.
+        n_ranks : int, optional
+            The highest rank that needs a value. The array is padded with zeros up to this rank if the table stops before it.
+
+        Returns
+        -------
+        np.ndarray
+            An array where entry `r` is the value of rank `r`. Entry 0 (still competing) is 0.
+        """
+        if kind not in self.rank_values:
+            raise ValueError(f"Unknown kind: {kind}")
+        values = self.rank_values[kind]
+        if n_ranks >= len(values):
+            values = np.pad(values, (0, n_ranks + 1 - len(values)))
+        return values
+
     def get_event_scores(self):
         """How many points is each event worth?"""
         return self.event_scores
@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+
+from .simulation import get_team_values
+
+
+class Scenario:
+    """A hypothetical branch of a league, for answering "what if" questions without changing the league.
+
+    A scenario starts from the league's current state and applies hypothetical eliminations, performance events and finale results to itself only. The league's score tables are shared with every scenario and never written to. The only state a scenario owns is one rank and one extra performance score per queen, and those are only copied the first time a scenario changes them, so making a scenario or branching one is cheap.
+
+    Parameters
+    ----------
+    league : League
+        The league to branch from. It should not have episodes added while its scenarios are in use.
+    parent : Scenario, optional
+        The scenario to branch from, instead of the league's current state. Use `Scenario.branch` rather than passing this directly.
+
+    Attributes
+    ----------
+    league : League
+        The league the scenario branches from.
+    rank : np.ndarray
+        The rank of each queen in cast order, 0 if she is still competing.
+    extra_performance : np.ndarray
+        The hypothetical performance score added to each queen, in cast order.
+    n_remaining : int
+        The number of queens still competing.
+    """
+
+    def __init__(self, league, parent=None):
+        self.league = league
+        if parent is None:
+            self._tables = self._get_tables(league)
+            self.rank = league.cast.get_ranks().values
+            self.extra_performance = np.zeros(len(self.rank), dtype=int)
+            self.n_remaining = league.cast.num_remaining_queens()
+        else:
+            self._tables = parent._tables
+            self.rank = parent.rank
+            self.extra_performance = parent.extra_performance
+            self.n_remaining = parent.n_remaining
+        # Arrays are shared with the league or parent until this scenario changes them
+        self._owns_rank = False
+        self._owns_performance = False
+
+    @staticmethod
+    def _get_tables(league):
+        """Build the lookup tables every scenario from this league shares."""
+        n_queens = len(league.cast.get_queen_names())
+        return {
+            "team_values": get_team_values(league),
+            "queen_lookup": league.rules.get_rank_values("queen", n_queens),
+            "event_scores": league.rules.get_event_scores(),
+            "team_weights": league.team_weights.values,
+            "base_performance": league.total_performance_scores().values,
+        }
+
+    def _get_ids(self, queen_names):
+        """Translate queen names to ids, reporting every unknown name at once."""
+        if isinstance(queen_names, str):
+            queen_names = [queen_names]
+        return self.league.cast.get_registry().translate(list(queen_names), "Scenario")
+
+    def _set_rank(self, queen_ids, rank):
+        """Give queens a rank, copying the ranks first if they are still shared."""
+        if not self._owns_rank:
+            self.rank = self.rank.copy()
+            self._owns_rank = True
+        self.n_remaining -= int((self.rank[queen_ids] == 0).sum())
+        self.rank[queen_ids] = rank
+
+    def branch(self):
+        """Make a new scenario that starts from this one. Changes to either one do not affect the other."""
+        return Scenario(self.league, parent=self)
+
+    def eliminate(self, queen_names):
+        """Eliminate queens in the scenario. Queens eliminated together share the same rank, like in `League.add_episode`.
+
+        Returns
+        -------
+        Scenario
+            This scenario, so calls can be chained.
+        """
+        queen_ids = np.unique(self._get_ids(queen_names))
+        already_out = self.league.cast.get_queen_names()[queen_ids][
+            self.rank[queen_ids] > 0
+        ]
+        if len(already_out) > 0:
+            raise ValueError(
+                f"Queens have already been eliminated: {already_out.tolist()}"
+            )
+        if len(queen_ids) > 0:
+            self._set_rank(queen_ids, self.n_remaining - len(queen_ids) + 1)
+        return self
+
+    def add_events(self, event, queen_names):
+        """Give queens a performance event in the scenario. Events that are not in the league's event scores are worth 0, like in `League.add_episode`.
+
+        Returns
+        -------
+        Scenario
+            This scenario, so calls can be chained.
+        """
+        queen_ids = self._get_ids(queen_names)
+        if not self._owns_performance:
+            self.extra_performance = self.extra_performance.copy()
+            self._owns_performance = True
+        value = int(self._tables["event_scores"].get(event, 0))
+        np.add.at(self.extra_performance, queen_ids, value)
+        return self
+
+    def crown(self, winner, runners_up=()):
+        """Finish the season in the scenario with a winner and runners-up, like the finale in `League.add_episode`.
+
+        Returns
+        -------
+        Scenario
+            This scenario, so calls can be chained.
+        """
+        runner_up_ids = np.unique(self._get_ids(runners_up))
+        if len(runner_up_ids) > 0:
+            self._set_rank(runner_up_ids, 2)
+        self._set_rank(self._get_ids(winner), 1)
+        return self
+
+    def _get_performance_totals(self):
+        """The total performance score for each contestant in the scenario."""
+        tables = self._tables
+        return (
+            tables["base_performance"] + tables["team_weights"] @ self.extra_performance
+        )
+
+    def _get_rank_totals(self, rank=None):
+        """The total rank score for each contestant, for the scenario's ranks or for a stack of alternative ranks with one set per row."""
+        if rank is None:
+            rank = self.rank
+        queen_values = self._tables["queen_lookup"][rank]
+        return queen_values @ self._tables["team_values"].T
+
+    def total_scores(self):
+        """Calculate the total scores for each contestant in the scenario.
+
+        Returns
+        -------
+        pd.DataFrame
+            The same DataFrame as `League.total_scores`, with the scenario's eliminations, events and finale applied.
+        """
+        total_performance = pd.Series(
+            self._get_performance_totals(),
+            index=self.league.team_weights.index,
+            name="total_performance_score",
+        )
+        total_rank = pd.Series(
+            self._get_rank_totals(),
+            index=self.league.team_weights.index,
+            name="total_rank_score",
+        )
+        scores = pd.concat([total_performance, total_rank], axis=1)
+        scores["total_score"] = total_performance + total_rank
+        return scores
+
+    def next_elimination_scores(self):
+        """What would each contestant's total score be if each of the remaining queens went home next?
+
+        Every possible elimination is evaluated at once in a single matrix product, without making a scenario for each one.
+
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame where the index is the contestant's name and the columns are the names of the queens still competing. The values are the contestant's total score if that queen is eliminated next on her own.
+        """
+        remaining = np.flatnonzero(self.rank == 0)
+        ranks = np.tile(self.rank, (len(remaining), 1))
+        ranks[np.arange(len(remaining)), remaining] = self.n_remaining
+        scores = self._get_performance_totals() + self._get_rank_totals(ranks)
+        scores = pd.DataFrame(
+            scores.T,
+            index=self.league.team_weights.index,
+            columns=self.league.cast.get_queen_names()[remaining],
+        )
+        return scores
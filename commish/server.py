@@ -0,0 +1,299 @@
+import os
+import copy
+import json
+import asyncio
+import hashlib
+from glob import glob
+
+from .build import load_league
+
+# Maps each score endpoint to the League method that produces it
+SCORE_ENDPOINTS = {
+    "total_scores": "total_scores",
+    "weekly_scores": "get_weekly_scores",
+    "rank_scores": "get_rank_scores",
+    "performance_scores": "get_performance_scores",
+}
+
+STATUS_TEXT = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class ScoreboardServer:
+    """A small HTTP server that keeps every season's league in memory and serves its scores as JSON.
+
+    Endpoints:
+    - `GET /seasons` lists the seasons and how many episodes each one has.
+    - `GET /seasons/<season>/<scores>` gets a season's scores, where `<scores>` is one of `total_scores`, `weekly_scores`, `rank_scores` or `performance_scores`.
+    - `POST /seasons/<season>/refresh` adds any new episode files for a season right away instead of waiting for the next poll.
+
+    Responses are built once and cached with an ETag, so a client that sends the ETag back in `If-None-Match` gets an empty 304 response until the scores change. The cache for a season is only cleared when a new episode is added to it.
+
+    Parameters
+    ----------
+    season_configs : list of dict
+        The season configs, formatted like `schemas/season-config.yml`.
+    snapshot_dir : str, optional
+        Directory for league snapshots. See `commish.build.load_league`.
+    poll_interval : float, optional
+        How often to check each season's `episodes_dir` for new episode files, in seconds. If None, seasons are only updated by the refresh endpoint.
+
+    Attributes
+    ----------
+    seasons : dict
+        Maps each season (as a string) to a dict with its 'config', 'league' and response 'cache', and the 'lock' that keeps its refreshes from overlapping once it has been refreshed.
+    poll_interval : float or None
+        How often to check for new episode files, in seconds.
+    """
+
+    def __init__(self, season_configs, snapshot_dir=None, poll_interval=5.0):
+        self.snapshot_dir = snapshot_dir
+        self.poll_interval = poll_interval
+        self.seasons = {}
+        for season_config in season_configs:
+            league = load_league(season_config, snapshot_dir=snapshot_dir)
+            self.seasons[str(season_config["season"])] = {
+                "config": season_config,
+                "league": league,
+                "cache": {},
+            }
+
+    def _add_new_episodes(self, season):
+        """Add any episode files for a season that the league has not seen yet to a copy of its league. This reads files and scores episodes, so it runs on a worker thread, and the league being served is never changed while requests are reading it.
+
+        Returns
+        -------
+        tuple
+            The updated copy of the league, or None if there were no new episodes, and the number of episodes added.
+        """
+        entry = self.seasons[season]
+        league = entry["league"]
+        episodes = sorted(glob(os.path.join(entry["config"]["episodes_dir"], "*.json")))
+        new_episodes = episodes[league.episode_number :]
+        if len(new_episodes) == 0:
+            return None, 0
+
+        league = copy.deepcopy(league)
+        league.add_episodes(new_episodes)
+        if self.snapshot_dir is not None:
+            league.save_snapshot(
+                os.path.join(self.snapshot_dir, f"{league.season}.npz")
+            )
+        return league, len(new_episodes)
+
+    async def refresh(self, season):
+        """Add any episode files for a season that the league has not seen yet, clearing its cached responses if there were any.
+
+        The files are read and scored on a worker thread, and the updated league replaces the old one in a single step once it is ready. Refreshes of the same season run one at a time.
+
+        Returns
+        -------
+        int
+            The number of episodes added.
+        """
+        entry = self.seasons[season]
+        if "lock" not in entry:
+            entry["lock"] = asyncio.Lock()
+        async with entry["lock"]:
+            loop = asyncio.get_running_loop()
+            league, added = await loop.run_in_executor(
+                None, self._add_new_episodes, season
+            )
+            if league is not None:
+                entry["league"] = league
+                entry["cache"].clear()
+        return added
+
+    async def poll(self):
+        """Check every season for new episode files forever, every `poll_interval` seconds."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            for season in self.seasons:
+                try:
+                    await self.refresh(season)
+                except Exception as e:
+                    # A half-written or broken file should not stop the polling
+                    print(f"Could not update season {season}: {type(e).__name__}: {e}")
+
+    @staticmethod
+    def _make_response(payload):
+        """Encode a response body and tag it with a hash of its contents."""
+        body = json.dumps(payload).encode()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        return etag, body
+
+    def get_seasons_response(self):
+        """Build the response listing every season."""
+        return self._make_response(
+            {
+                season: {
+                    "episode": entry["league"].episode_number,
+                    "remaining_queens": entry["league"].cast.num_remaining_queens(),
+                }
+                for season, entry in self.seasons.items()
+            }
+        )
+
+    def get_scores_response(self, season, scores):
+        """Get the cached response for a season's scores, building it if it is not cached yet."""
+        entry = self.seasons[season]
+        if scores not in entry["cache"]:
+            league = entry["league"]
+            frame = getattr(league, SCORE_ENDPOINTS[scores])()
+            entry["cache"][scores] = self._make_response(
+                {
+                    "season": season,
+                    "episode": league.episode_number,
+                    "scores": json.loads(frame.to_json(orient="index")),
+                }
+            )
+        return entry["cache"][scores]
+
+    async def route(self, method, path):
+        """Find the response for a request.
+
+        Returns
+        -------
+        tuple
+            The status code, the ETag (for a 200 status) and the body.
+        """
+        parts = [p for p in path.split("?")[0].split("/") if p]
+        if parts == ["seasons"]:
+            if method not in ["GET", "HEAD"]:
+                return 405, None, None
+            return (200, *self.get_seasons_response())
+
+        if len(parts) != 3 or parts[0] != "seasons" or parts[1] not in self.seasons:
+            return 404, None, None
+        season, action = parts[1], parts[2]
+        if action == "refresh":
+            if method != "POST":
+                return 405, None, None
+            try:
+                added = await self.refresh(season)
+            except ValueError as e:
+                return (400, None, json.dumps({"error": str(e)}).encode())
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                return (500, None, json.dumps({"error": error}).encode())
+            return (200, *self._make_response({"season": season, "added": added}))
+        if action not in SCORE_ENDPOINTS:
+            return 404, None, None
+        if method not in ["GET", "HEAD"]:
+            return 405, None, None
+        return (200, *self.get_scores_response(season, action))
+
+    async def handle(self, reader, writer):
+        """Answer HTTP/1.1 requests on one connection until the client closes it."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._send(writer, 400, None, None, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                # Request bodies are not used, but have to be read to get to the next request
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._send(writer, 400, None, None, keep_alive=False)
+                    break
+                if length > 0:
+                    await reader.readexactly(length)
+
+                keep_alive = headers.get("connection", "").lower() != "close" and (
+                    version == "HTTP/1.1"
+                )
+                try:
+                    status, etag, body = await self.route(method, path)
+                except Exception as e:
+                    # The connection is closed after the error, in case the route left anything half done
+                    error = f"{type(e).__name__}: {e}"
+                    status, etag, body = (
+                        500,
+                        None,
+                        json.dumps({"error": error}).encode(),
+                    )
+                    keep_alive = False
+                if status == 200 and method in ["GET", "HEAD"]:
+                    # "*" matches whatever the current version of the resource is
+                    etags = self._parse_etags(headers.get("if-none-match", ""))
+                    if "*" in etags or etag in etags:
+                        status, body = 304, None
+                await self._send(
+                    writer,
+                    status,
+                    etag,
+                    body,
+                    keep_alive=keep_alive,
+                    head=method == "HEAD",
+                )
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    def _parse_etags(header):
+        """Get the ETags listed in an If-None-Match header."""
+        if header.strip() == "*":
+            return {"*"}
+        tags = [tag.strip() for tag in header.split(",")]
+        return {tag[2:] if tag.startswith("W/") else tag for tag in tags if tag}
+
+    @staticmethod
+    async def _send(writer, status, etag, body, keep_alive=True, head=False):
+        """Write a response to the client. For a HEAD request, only the headers are sent."""
+        headers = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body) if body is not None else 0}",
+            # Clients have to check back every time, but usually get a 304
+            "Cache-Control: no-cache",
+            "Access-Control-Allow-Origin: *",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if etag is not None:
+            headers.append(f"ETag: {etag}")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1"))
+        if body is not None and not head:
+            writer.write(body)
+        await writer.drain()
+
+    async def serve(self, host="127.0.0.1", port=8000):
+        """Serve requests until the process is stopped."""
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Serving {len(self.seasons)} season(s) on http://{host}:{port}/seasons")
+        if self.poll_interval is not None:
+            poller = asyncio.ensure_future(self.poll())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self.poll_interval is not None:
+                poller.cancel()
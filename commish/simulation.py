@@ -0,0 +1,272 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+
+def get_team_values(league):
+    """How much is each queen worth to each contestant based on where they ranked her?
+
+    Returns
+    -------
+    np.ndarray
+        A contestants x queens matrix, with contestants sorted by name and queens in cast order.
+    """
+    order = np.argsort(league.contestants.names.values, kind="stable")
+    return league.team_values[order]
+
+
+def _sample_finishes(rng, log_strength, n_finalists, p_double, n_sims):
+    """Sample how the queens still competing finish, including ties, and how many of the regular episodes left each of them is eliminated after.
+
+    Returns
+    -------
+    ranks : np.ndarray
+        A sims x queens matrix of final ranks. The winner is ranked 1 and the other finalists share rank 2. Queens eliminated together share the highest rank between them.
+    blocks : np.ndarray
+        A sims x queens matrix of the order the queens leave in: 0 for the first queen or pair eliminated, 1 for the next and so on. Finalists are -1.
+    n_blocks : np.ndarray
+        The number of eliminations before the finale in each simulation.
+    """
+    n_queens = log_strength.shape[-1]
+    # Gumbel-max trick: sorting noisy log-strengths samples a finishing order where stronger queens tend to place higher
+    keys = log_strength + rng.gumbel(size=(n_sims, n_queens))
+    order = np.argsort(-keys, axis=1)
+
+    # Walk up from last place, sending home one queen at a time or, sometimes, two
+    place_ranks = np.ones((n_sims, n_queens), dtype=int)
+    place_blocks = np.full((n_sims, n_queens), -1)
+    place_ranks[:, 1:n_finalists] = 2
+    doubles = rng.random((n_sims, n_queens)) < p_double
+    place = np.full(n_sims, n_queens)
+    n_blocks = np.zeros(n_sims, dtype=int)
+    rows = np.arange(n_sims)
+    while True:
+        active = place > n_finalists
+        if not active.any():
+            break
+        size = np.where(doubles[rows, place - 1] & (place - 2 >= n_finalists), 2, 1)
+        size[~active] = 0
+        top = place - size + 1
+        for k in range(2):
+            member = active & (size > k)
+            place_ranks[rows[member], place[member] - 1 - k] = top[member]
+            place_blocks[rows[member], place[member] - 1 - k] = n_blocks[member]
+        n_blocks += active
+        place -= size
+
+    ranks = np.empty_like(place_ranks)
+    blocks = np.empty_like(place_blocks)
+    np.put_along_axis(ranks, order, place_ranks, axis=1)
+    np.put_along_axis(blocks, order, place_blocks, axis=1)
+    return ranks, blocks, n_blocks
+
+
+def _draw_weeks(rng, history, n_sims, n_episodes, prior_weeks):
+    """Draw each queen's performance score in each of the `n_episodes` regular episodes left from the weekly scores so far.
+
+    Each week, a queen with `n` weeks of `history` gets one of her own past scores with probability `n / (n + prior_weeks)`, and otherwise the score of a random queen in a random past week, so early in the season her future leans on how every queen has done.
+
+    Returns
+    -------
+    np.ndarray
+        A sims x queens x episodes array of scores.
+    """
+    n_queens, n_weeks = history.shape
+    draws = np.zeros((n_sims, n_queens, n_episodes))
+    if n_weeks == 0:
+        return draws
+    shape = (n_sims, n_queens, n_episodes)
+    own = rng.random(shape) < n_weeks / (n_weeks + prior_weeks)
+    queens = np.where(
+        own, np.arange(n_queens)[:, None], rng.integers(0, n_queens, shape)
+    )
+    draws[:] = history[queens, rng.integers(0, n_weeks, shape)]
+    return draws
+
+
+def _weeks_competed(blocks, n_blocks, n_episodes):
+    """How many of the `n_episodes` regular episodes left each queen competes in, given the order the queens leave in from `_sample_finishes`. The eliminations are spread evenly over the episodes, and finalists compete in all of them."""
+    spread = blocks * n_episodes // np.maximum(n_blocks, 1)[:, None] + 1
+    return np.where(blocks < 0, n_episodes, np.minimum(spread, n_episodes))
+
+
+def _simulate_batch(
+    seed,
+    n_sims,
+    batch_size,
+    remaining,
+    past_performance,
+    skill_weight,
+    n_finalists,
+    p_double,
+    history,
+    prior_weeks,
+    n_episodes,
+    fixed_queen_values,
+    queen_lookup,
+    team_values,
+    team_weights,
+    base_scores,
+):
+    """Simulate `n_sims` finishes of the season and tally the results for each contestant."""
+    rng = np.random.default_rng(seed)
+    n_contestants = len(base_scores)
+    wins = np.zeros(n_contestants)
+    top_three = np.zeros(n_contestants)
+    score_sum = np.zeros(n_contestants)
+
+    for start in range(0, n_sims, batch_size):
+        batch = min(batch_size, n_sims - start)
+        draws = _draw_weeks(rng, history, batch, n_episodes, prior_weeks)
+
+        # Queens who do better over the whole season, including the simulated episodes, are more likely to place higher
+        strength = past_performance + draws.sum(axis=2)
+        log_strength = np.zeros_like(strength)
+        if len(remaining) > 1:
+            spread = strength.std(axis=1, keepdims=True)
+            np.divide(
+                skill_weight * (strength - strength.mean(axis=1, keepdims=True)),
+                spread,
+                out=log_strength,
+                where=spread > 0,
+            )
+        ranks, blocks, n_blocks = _sample_finishes(
+            rng, log_strength, n_finalists, p_double, batch
+        )
+        competed = _weeks_competed(blocks, n_blocks, n_episodes)
+        performance = (draws * (np.arange(n_episodes) < competed[:, :, None])).sum(
+            axis=2
+        )
+
+        queen_values = np.tile(fixed_queen_values, (batch, 1))
+        queen_values[:, remaining] = queen_lookup[ranks]
+        scores = (
+            base_scores
+            + queen_values @ team_values.T
+            + performance @ team_weights[:, remaining].T
+        )
+
+        # Contestants tied for first all count as winning
+        wins += (scores == scores.max(axis=1, keepdims=True)).sum(axis=0)
+        if n_contestants > 3:
+            third = np.partition(scores, n_contestants - 3, axis=1)[
+                :, [n_contestants - 3]
+            ]
+            top_three += (scores >= third).sum(axis=0)
+        else:
+            top_three += batch
+        score_sum += scores.sum(axis=0)
+
+    return wins, top_three, score_sum
+
+
+def simulate_season(
+    league,
+    n_sims=10000,
+    seed=None,
+    skill_weight=1.0,
+    batch_size=1000,
+    jobs=1,
+    remaining_episodes=None,
+    n_finalists=3,
+    prior_weeks=4,
+):
+    """Simulate the rest of the season many times to estimate each contestant's odds.
+
+    Each simulation first draws every remaining queen's performance score in each regular episode left from the weekly scores so far (see `_draw_weeks`), then gives the queens a random finishing order with the rank scores from the league's `Rules`. Queens with higher total performance scores over the whole season, counting the simulated episodes, are more likely to place higher. The finale has `n_finalists` queens: the winner is ranked first and the others share second place as runners-up. The other queens are sent home one at a time or, as often as has happened so far this season, two at a time with a shared rank. The eliminations are spread evenly over the regular episodes before the finale, and a queen only scores the performance points from the episodes she competes in.
+
+    Points for queens who have already gone home, like Miss Congeniality, and points scored in the finale are not simulated.
+
+    Parameters
+    ----------
+    league : League
+        The league to simulate. It is not modified.
+    n_sims : int, optional
+        The number of simulated seasons. Default is 10000.
+    seed : int, optional
+        Seed for the random number generator, for reproducible results. The results only depend on the seed, `n_sims` and `batch_size`, not on `jobs`.
+    skill_weight : float, optional
+        How much a queen's performance affects her chances. 0 means every finishing order is equally likely. Default is 1.0.
+    batch_size : int, optional
+        The number of seasons simulated at once in a single array. Default is 1000.
+    jobs : int, optional
+        The number of worker processes. Default is 1, which runs in this process.
+    remaining_episodes : int, optional
+        How many episodes have not aired, including the finale. Default is a rough guess of one for every queen still competing.
+    n_finalists : int, optional
+        How many queens make it to the finale. Default is 3.
+    prior_weeks : float, optional
+        How much each queen's simulated scores lean on every queen's past weeks instead of her own, counted in weeks. Default is 4, so after four episodes half of her simulated weeks come from her own scores.
+
+    Returns
+    -------
+    pd.DataFrame
+        A DataFrame where the index is the contestant's name and the columns are 'p_first' (the probability of finishing first, counting ties), 'p_top_three' (the probability of finishing in the top three, counting ties) and 'expected_score' (the average final total score).
+    """
+    cast = league.cast
+    n_queens = len(cast.get_queen_names())
+    ranks = cast.get_ranks().values
+    remaining = np.flatnonzero(ranks == 0)
+    if remaining_episodes is None:
+        remaining_episodes = len(remaining)
+
+    queen_lookup = league.rules.get_rank_values("queen", n_queens)
+    fixed_queen_values = queen_lookup[ranks]
+    team_values = get_team_values(league)
+    team_weights = league.team_weights.values
+    base_scores = league.total_performance_scores().values
+
+    past_performance = league.get_performance_scores().sum(axis=1).values[remaining]
+
+    # Each remaining queen's score in every episode so far, including episodes where she had no events
+    weekly = league.performance_scores[remaining]
+    history = np.zeros((len(remaining), league.episode_number))
+    history[:, : weekly.shape[1]] = weekly
+
+    # How often an elimination so far sent more than one queen home
+    weeks = cast.week_eliminated[cast.eliminated]
+    _, per_week = np.unique(weeks, return_counts=True)
+    p_double = (per_week > 1).mean() if len(per_week) > 0 else 0.0
+
+    # Split the simulations into batches, each with its own independent random stream
+    batch_sizes = [
+        min(batch_size, n_sims - start) for start in range(0, n_sims, batch_size)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(batch_sizes))
+    args = (
+        remaining,
+        past_performance,
+        skill_weight,
+        min(n_finalists, len(remaining)),
+        p_double,
+        history,
+        prior_weeks,
+        max(remaining_episodes - 1, 0),
+        fixed_queen_values,
+        queen_lookup,
+        team_values,
+        team_weights,
+        base_scores,
+    )
+    if jobs == 1:
+        results = [
+            _simulate_batch(s, n, batch_size, *args) for s, n in zip(seeds, batch_sizes)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [
+                pool.submit(_simulate_batch, s, n, batch_size, *args)
+                for s, n in zip(seeds, batch_sizes)
+            ]
+            results = [future.result() for future in futures]
+
+    wins, top_three, score_sum = (np.sum(r, axis=0) for r in zip(*results))
+    odds = pd.DataFrame(
+        {
+            "p_first": wins / n_sims,
+            "p_top_three": top_three / n_sims,
+            "expected_score": score_sum / n_sims,
+        },
+        index=league.team_weights.index,
+    )
+    return odds
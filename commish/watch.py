@@ -0,0 +1,220 @@
+import os
+import time
+from glob import glob
+import yaml
+
+from .build import load_league, render_season
+from .history import HistoryStore
+from .rules import clear_rules_tables
+
+
+def get_file_states(paths):
+    """Get the modification time and size of each file, or None for files that do not exist."""
+    states = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            states[path] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            states[path] = None
+    return states
+
+
+class SeasonWatcher:
+    """Keep a season's page up to date as its input files change, doing as little work as possible.
+
+    The watcher polls the files a season is built from:
+    - If a new episode file appears after the ones already added, it is added to the league in memory and the page is rendered again. Only the plots whose data changed are drawn again.
+    - If the season config, the queens, the contestants, the rules, or an episode that was already added changes, the league is loaded again from scratch.
+    - If only a template changes, the page is rendered again without touching the league.
+
+    Parameters
+    ----------
+    season_config_file : str
+        Path to the season config YAML file.
+    output_dir : str, optional
+        Base directory for files to be output. Things will go to `<output_dir>/seasons/<season>`.
+    snapshot_dir : str, optional
+        Directory for league snapshots. See `commish.build.load_league`.
+    plot_jobs : int, optional
+        The number of processes used to draw the plots. See `commish.build.make_plots`.
+    templates_dir : str, optional
+        The directory containing the Jinja templates.
+    verify : bool, optional
+        Check the running scores against a full recompute after every episode.
+    history_file : str, optional
+        Path to a SQLite history store. If set, the season's scores are recorded in it every time the page is written. See `commish.history.HistoryStore`.
+
+    Attributes
+    ----------
+    season_config : dict
+        The current season config.
+    league : League
+        The league, with every episode added so far.
+    applied : dict
+        The state of each episode file when it was added to the league, see `get_file_states`.
+    """
+
+    def __init__(
+        self,
+        season_config_file,
+        output_dir="site-build",
+        snapshot_dir=None,
+        plot_jobs=None,
+        templates_dir="templates",
+        verify=False,
+        history_file=None,
+    ):
+        self.season_config_file = season_config_file
+        self.output_dir = output_dir
+        self.snapshot_dir = snapshot_dir
+        self.plot_jobs = plot_jobs
+        self.templates_dir = templates_dir
+        self.verify = verify
+        self.history_file = history_file
+        self.season_config = None
+        self.league = None
+        self.applied = {}
+        self.seen = {}
+        self.render_state = {}
+
+    def _get_input_files(self):
+        """Get the files that, if changed, mean the league has to be loaded again."""
+        config = self.season_config
+        return [
+            self.season_config_file,
+            config["queens"],
+            config["contestants"],
+            config["rank_scores"],
+            config["event_scores"],
+        ]
+
+    def _get_episode_files(self):
+        """Get every episode file for the season, in order."""
+        return sorted(glob(os.path.join(self.season_config["episodes_dir"], "*.json")))
+
+    def _get_template_files(self):
+        """Get every template file."""
+        return sorted(glob(os.path.join(self.templates_dir, "**", "*"), recursive=True))
+
+    def _get_page_dir(self):
+        """Get the directory the season's page is written to."""
+        page_dir = os.path.join(
+            self.output_dir, "seasons", str(self.season_config["season"])
+        )
+        os.makedirs(page_dir, exist_ok=True)
+        return page_dir
+
+    def reload(self):
+        """Read the season config and load the league again from scratch."""
+        with open(self.season_config_file, "r") as f:
+            self.season_config = yaml.safe_load(f)
+        clear_rules_tables()
+        episodes = self._get_episode_files()
+        self.league = load_league(
+            self.season_config, snapshot_dir=self.snapshot_dir, verify=self.verify
+        )
+        self.applied = get_file_states(episodes[: self.league.episode_number])
+        self.render_state = {"plot_hashes": {}}
+
+    def render(self):
+        """Write the page and any plots that changed, and record the scores in the history store if there is one."""
+        render_season(
+            self.league,
+            self.season_config,
+            self._get_page_dir(),
+            plot_jobs=self.plot_jobs,
+            state=self.render_state,
+        )
+        if self.history_file is not None:
+            # Only the weeks added since the last update are written
+            with HistoryStore(self.history_file) as store:
+                store.record_season(self.league)
+
+    def _add_new_episodes(self, episodes, states):
+        """Add the episode files after the last one in the league, or load it again if an episode that was already added has changed.
+
+        Returns
+        -------
+        bool
+            Whether the league changed.
+        """
+        n_applied = len(self.applied)
+        if {f: states[f] for f in episodes[:n_applied]} != self.applied:
+            print("An episode that was already added changed, reloading the league")
+            self.reload()
+            return True
+
+        new_episodes = episodes[n_applied:]
+        if len(new_episodes) == 0:
+            return False
+        self.league.add_episodes(new_episodes)
+        if self.snapshot_dir is not None:
+            self.league.save_snapshot(
+                os.path.join(self.snapshot_dir, f"{self.league.season}.npz")
+            )
+        self.applied.update({f: states[f] for f in new_episodes})
+        return True
+
+    def check(self):
+        """Look for changed files once and update the page if anything relevant changed.
+
+        Returns
+        -------
+        bool
+            Whether the page was written.
+        """
+        if self.league is None:
+            self.reload()
+            self.seen = self._get_all_states()
+            self.render()
+            return True
+
+        states = self._get_all_states()
+        if states == self.seen:
+            return False
+        changed = {
+            f for f in set(states) | set(self.seen) if states.get(f) != self.seen.get(f)
+        }
+        self.seen = states
+
+        try:
+            if changed & set(self._get_input_files()):
+                print("Season inputs changed, reloading the league")
+                self.reload()
+                self.seen = self._get_all_states()
+            elif changed & set(self._get_episode_files()) or changed & set(
+                self.applied
+            ):
+                if not self._add_new_episodes(self._get_episode_files(), states):
+                    return False
+            elif not changed & set(self._get_template_files()):
+                return False
+        except (ValueError, OSError, yaml.YAMLError) as e:
+            # Files are often caught half-written, so wait for the next change
+            print(f"Could not update the season: {e}")
+            return False
+
+        start = time.perf_counter()
+        self.render()
+        print(
+            f"Updated season {self.season_config['season']} through episode {self.league.episode_number} in {time.perf_counter() - start:.2f}s"
+        )
+        return True
+
+    def _get_all_states(self):
+        """Get the state of every file the page depends on."""
+        return get_file_states(
+            self._get_input_files()
+            + self._get_episode_files()
+            + list(self.applied)
+            + self._get_template_files()
+        )
+
+    def watch(self, interval=1.0):
+        """Check for changes every `interval` seconds until the process is stopped."""
+        self.check()
+        print(f"Watching season {self.season_config['season']} for changes")
+        while True:
+            time.sleep(interval)
+            self.check()
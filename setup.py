@@ -6,6 +6,8 @@ setup(
     description="Fantasy league management for RuPaul's Drag Race",
     author="Ryan Z Friedman",
     packages=["commish"],
-    install_requires=["pandas", "numpy", "matplotlib", "tabulate", "pyyaml", "jinja2"],
-    python_requires=">=3.7",
+    install_requires=["pandas", "numpy", "matplotlib", "pyyaml", "jinja2"],
+    extras_require={"test": ["pytest", "tabulate"]},
+    python_requires=">=3.9",
+    entry_points={"console_scripts": ["commish=commish.cli:main"]},
 )
@@ -0,0 +1,226 @@
+// Draws the scoreboard charts in the browser from the chart data bundle written by commish.build.write_chart_data.
+// Each chart is a <div class="commish-chart" data-chart="<name>" data-src="<bundle>"> on the season page.
+(function () {
+    "use strict";
+
+    // Colormaps sampled at 11 evenly spaced points from matplotlib. Names ending in "_r" are reversed.
+    var COLORMAPS = {
+        viridis: "440154 482475 414487 355f8d 2a788e 21918c 22a884 44bf70 7ad151 bddf26 fde725",
+        plasma: "0d0887 41049d 6a00a8 8f0da4 b12a90 cc4778 e16462 f2844b fca636 fcce25 f0f921",
+        inferno: "000004 160b39 420a68 6a176e 932667 bc3754 dd513a f37819 fca50a f6d746 fcffa4",
+        magma: "000004 140e36 3b0f70 641a80 8c2981 b73779 de4968 f7705c fe9f6d fecf92 fcfdbf",
+        cividis: "00224e 083370 35456c 4f576c 666970 7d7c78 948e77 aea371 c8b866 e5cf52 fee838",
+        PuOr: "7f3b08 b25706 e08214 fcb761 fee0b6 f6f6f7 d8daeb b1aad1 8073ac 532687 2d004b",
+        RdBu: "67001f b1182b d6604d f3a481 fddbc7 f6f7f7 d1e5f0 90c4dd 4393c3 2065ab 053061",
+        RdYlBu: "a50026 d62f27 f46d43 fdad60 fee090 feffc0 e0f3f8 aad8e9 74add1 4574b3 313695",
+        RdYlGn: "a50026 d62f27 f46d43 fdad60 fee08b feffbe d9ef8b a5d86a 66bd63 199750 006837",
+        coolwarm: "3b4cc0 5977e3 7b9ff9 9ebeff c0d4f5 dddcdc f2cbb7 f7ac8e ee8468 d65244 b40426",
+        BrBG: "543005 8b500a bf812d dec17b f6e8c3 f4f5f5 c7eae5 7fccc0 35978f 01655d 003c30",
+        PiYG: "8e0152 c41a7c de77ae f1b5d9 fde0ef f7f7f6 e6f5d0 b7e085 7fbc41 4c9121 276419",
+        PRGn: "40004b 752982 9970ab c1a4ce e7d4e8 f6f7f6 d9f0d3 a5da9f 5aae61 1a7736 00441b",
+        Spectral: "9e0142 d43d4f f46d43 fdad60 fee08b ffffbe e6f598 aadca4 66c2a5 3387bc 5e4fa2",
+        bwr: "0000ff 3232ff 6666ff 9898ff ccccff fffefe ffcccc ff9898 ff6666 ff3232 ff0000",
+        seismic: "00004c 000092 0000db 3131ff 9999ff fffdfd ff9999 ff3131 e60000 b20000 800000",
+        Blues: "f7fbff e3eef9 d0e1f2 b7d4ea 94c4df 6aaed6 4a98c9 2e7ebc 1764ab 084a91 08306b",
+        Reds: "fff5f0 fee5d8 fdcab5 fcab8f fc8a6a fb694a f14432 d92523 bc141a 980c13 67000d",
+        Greens: "f7fcf5 e9f7e5 d3eecd b8e3b2 98d594 73c476 4bb062 2f974e 157f3b 006428 00441b",
+        Purples: "fcfbfd f2f0f7 e2e2ef cecfe5 b6b6d8 9e9ac8 8683bd 7262ac 61409b 4f1f8b 3f007d",
+        Greys: "ffffff f3f3f3 e2e2e2 cecece b5b5b5 959595 7a7a7a 5f5f5f 404040 1d1d1d 000000"
+    };
+
+    var SVG_NS = "http://www.w3.org/2000/svg";
+    var CELL = 24;
+    var ROW = 22;
+    var FONT = 11;
+    var bundles = {};
+
+    function getColormap(name, fallback) {
+        var reversed = /_r$/.test(name);
+        var stops = COLORMAPS[name.replace(/_r$/, "")] || COLORMAPS[fallback];
+        stops = stops.split(" ").map(function (hex) {
+            return [0, 2, 4].map(function (i) { return parseInt(hex.substr(i, 2), 16); });
+        });
+        if (reversed) {
+            stops.reverse();
+        }
+        return function (x) {
+            x = Math.min(Math.max(isFinite(x) ? x : 0.5, 0), 1) * (stops.length - 1);
+            var i = Math.min(Math.floor(x), stops.length - 2);
+            var t = x - i;
+            var rgb = [0, 1, 2].map(function (k) {
+                return Math.round(stops[i][k] + t * (stops[i + 1][k] - stops[i][k]));
+            });
+            return "rgb(" + rgb.join(",") + ")";
+        };
+    }
+
+    function el(name, attrs, text) {
+        var node = document.createElementNS(SVG_NS, name);
+        Object.keys(attrs || {}).forEach(function (k) { node.setAttribute(k, attrs[k]); });
+        if (text !== undefined) {
+            node.textContent = text;
+        }
+        return node;
+    }
+
+    function svg(width, height) {
+        return el("svg", {
+            viewBox: "0 0 " + width + " " + height,
+            width: "100%",
+            style: "max-width:" + width + "px;font-family:sans-serif;font-size:" + FONT + "px",
+            role: "img"
+        });
+    }
+
+    // Math.min.apply and Math.max.apply pass every value as an argument, which fails on large leagues
+    function arrayMin(values, start) {
+        return values.reduce(function (lo, v) { return v < lo ? v : lo; }, start === undefined ? Infinity : start);
+    }
+
+    function arrayMax(values, start) {
+        return values.reduce(function (hi, v) { return v > hi ? v : hi; }, start === undefined ? -Infinity : start);
+    }
+
+    function labelWidth(labels) {
+        return 20 + 0.6 * FONT * arrayMax(labels.map(function (l) { return String(l).length; }), 1);
+    }
+
+    // Horizontal bars, one segment per series, with the total at the end of each bar
+    function drawBars(bundle, chart) {
+        var data = bundle.total_scores;
+        var series = chart === "stacked_total_scores" ?
+            [["rank", bundle.options.second_bar_color, "Rank Score"], ["performance", bundle.options.bar_color, "Performance Score"]] :
+            [["total", bundle.options.bar_color, null]];
+        var left = labelWidth(data.names);
+        var plotWidth = 420;
+        var lo = arrayMin(data.total, 0);
+        var hi = arrayMax(data.total, 1);
+        var scale = function (v) { return left + (v - lo) / (hi - lo) * plotWidth; };
+        var top = series.length > 1 ? 24 : 8;
+        var root = svg(left + plotWidth + 50, top + data.names.length * ROW + 8);
+
+        data.names.forEach(function (name, i) {
+            var y = top + i * ROW;
+            root.appendChild(el("text", { x: left - 6, y: y + ROW / 2 + 4, "text-anchor": "end" }, name));
+            var start = 0;
+            series.forEach(function (s) {
+                var v = data[s[0]][i];
+                var x0 = scale(Math.min(start, start + v));
+                root.appendChild(el("rect", { x: x0, y: y + 3, width: Math.abs(scale(start + v) - scale(start)), height: ROW - 6, fill: s[1] }));
+                start += v;
+            });
+            root.appendChild(el("text", { x: scale(Math.max(start, 0)) + 4, y: y + ROW / 2 + 4 }, data.total[i]));
+        });
+        if (lo < 0) {
+            root.appendChild(el("line", { x1: scale(0), x2: scale(0), y1: top, y2: top + data.names.length * ROW, stroke: "black" }));
+        }
+        if (series.length > 1) {
+            series.slice().reverse().forEach(function (s, i) {
+                root.appendChild(el("rect", { x: left + i * 140, y: 4, width: 12, height: 12, fill: s[1] }));
+                root.appendChild(el("text", { x: left + i * 140 + 16, y: 14 }, s[2]));
+            });
+        }
+        return root;
+    }
+
+    // Heatmap with a value in each cell, and optionally a bar of each row's total on the right
+    function drawHeatmap(bundle, chart) {
+        var data = bundle[chart];
+        var isRank = chart === "rank_scores";
+        var cmap = getColormap(isRank ? bundle.options.rank_scores_cmap : bundle.options.performance_cmap, isRank ? "plasma" : "PuOr_r");
+        var vmin = arrayMin(data.values.map(function (row) { return arrayMin(row); }));
+        var vmax = arrayMax(data.values.map(function (row) { return arrayMax(row); }));
+        var nCells = data.values.reduce(function (n, row) { return n + row.length; }, 0);
+        var norm;
+        if (isRank) {
+            norm = function (v) { return vmax > vmin ? (v - vmin) / (vmax - vmin) : 0; };
+        } else {
+            // Centered on 0, like matplotlib's CenteredNorm
+            var half = Math.max(Math.abs(vmin), Math.abs(vmax)) || 1;
+            norm = function (v) { return 0.5 + v / (2 * half); };
+        }
+        var annotate = nCells <= bundle.options.max_annotated_cells;
+        var light = data.low_is_light ? ["black", "white"] : ["white", "black"];
+
+        var left = labelWidth(data.rows);
+        var top = isRank ? 8 + 0.6 * FONT * arrayMax(data.columns.map(function (c) { return String(c).length; })) : 36;
+        var barWidth = data.totals ? 110 : 0;
+        var width = left + data.columns.length * CELL + barWidth + 10;
+        var root = svg(width, top + data.rows.length * CELL + 10);
+
+        data.columns.forEach(function (c, j) {
+            var x = left + j * CELL + CELL / 2;
+            if (isRank) {
+                root.appendChild(el("text", { x: x + 4, y: top - 4, transform: "rotate(-90 " + (x + 4) + " " + (top - 4) + ")" }, c));
+            } else {
+                root.appendChild(el("text", { x: x, y: top - 4, "text-anchor": "middle" }, c));
+            }
+        });
+        if (!isRank) {
+            root.appendChild(el("text", { x: left + data.columns.length * CELL / 2, y: 12, "text-anchor": "middle" }, "Episode"));
+        }
+        data.rows.forEach(function (r, i) {
+            var y = top + i * CELL;
+            root.appendChild(el("text", { x: left - 6, y: y + CELL / 2 + 4, "text-anchor": "end" }, r));
+            data.values[i].forEach(function (v, j) {
+                var x = left + j * CELL;
+                var cell = el("rect", { x: x, y: y, width: CELL, height: CELL, fill: cmap(norm(v)) });
+                cell.appendChild(el("title", {}, r + ", " + data.columns[j] + ": " + v));
+                root.appendChild(cell);
+                if (annotate) {
+                    root.appendChild(el("text", {
+                        x: x + CELL / 2, y: y + CELL / 2 + 4, "text-anchor": "middle", "font-size": FONT - 2,
+                        fill: Math.abs(v) < vmax / 2 ? light[0] : light[1]
+                    }, v));
+                }
+            });
+        });
+
+        if (data.totals) {
+            var x0 = left + data.columns.length * CELL + 10;
+            var lo = arrayMin(data.totals, 0);
+            var hi = arrayMax(data.totals, 1);
+            var scale = function (v) { return x0 + (v - lo) / (hi - lo) * (barWidth - 20); };
+            root.appendChild(el("text", { x: x0 + (barWidth - 20) / 2, y: top - 4, "text-anchor": "middle" }, "Total"));
+            data.totals.forEach(function (t, i) {
+                var bar = el("rect", { x: Math.min(scale(0), scale(t)), y: top + i * CELL + 3, width: Math.abs(scale(t) - scale(0)), height: CELL - 6, fill: bundle.options.bar_color });
+                bar.appendChild(el("title", {}, data.rows[i] + ": " + t));
+                root.appendChild(bar);
+            });
+        }
+        return root;
+    }
+
+    var DRAW = {
+        total_scores: drawBars,
+        stacked_total_scores: drawBars,
+        weekly_scores: drawHeatmap,
+        rank_scores: drawHeatmap,
+        weekly_performance_scores: drawHeatmap
+    };
+
+    function load(src) {
+        if (!bundles[src]) {
+            bundles[src] = fetch(src).then(function (response) { return response.json(); });
+        }
+        return bundles[src];
+    }
+
+    function drawAll() {
+        var charts = document.querySelectorAll(".commish-chart");
+        Array.prototype.forEach.call(charts, function (div) {
+            var chart = div.getAttribute("data-chart");
+            load(div.getAttribute("data-src")).then(function (bundle) {
+                div.appendChild(DRAW[chart](bundle, chart));
+            }).catch(function (error) {
+                div.textContent = "Could not load the chart: " + error;
+            });
+        });
+    }
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", drawAll);
+    } else {
+        drawAll();
+    }
+})();
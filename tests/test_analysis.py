@@ -0,0 +1,79 @@
+import os
+import itertools
+from glob import glob
+
+import numpy as np
+
+from commish.league import League
+from commish.analysis import score_bounds
+from commish.simulation import get_team_values
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEASON_DIR = os.path.join(REPO_DIR, "assets/seasons/18")
+EPISODES = sorted(glob(os.path.join(SEASON_DIR, "episodes", "*.json")))
+
+
+def make_league(n_episodes):
+    """A season 18 league with its first `n_episodes` episodes added."""
+    league = League(
+        season=18,
+        queens_file=os.path.join(SEASON_DIR, "queens.txt"),
+        contestant_file=os.path.join(SEASON_DIR, "contestants.tsv"),
+        rank_score_file=os.path.join(
+            REPO_DIR, "assets/rules/rank_values/final_three.tsv"
+        ),
+        event_scores_file=os.path.join(REPO_DIR, "assets/rules/event_scores/large.tsv"),
+    )
+    league.add_episodes(EPISODES[:n_episodes])
+    return league
+
+
+def get_finishes(n_queens):
+    """Every way `n_queens` queens can finish: the winner alone in first, then groups of consecutive places that share the highest one."""
+    for cuts in itertools.product([False, True], repeat=max(n_queens - 2, 0)):
+        starts = [1, 2] + [place + 3 for place, cut in enumerate(cuts) if cut]
+        places = [max(s for s in starts if s <= p) for p in range(1, n_queens + 1)]
+        for order in itertools.permutations(range(n_queens)):
+            ranks = np.empty(n_queens, dtype=int)
+            ranks[list(order)] = places
+            yield ranks
+
+
+def test_rank_bounds_match_every_finish():
+    league = make_league(12)
+    ranks = league.cast.get_ranks().values.copy()
+    remaining = np.flatnonzero(ranks == 0)
+    assert len(remaining) == 5
+
+    lookup = league.rules.get_rank_values("queen", len(ranks))
+    team_values = get_team_values(league)
+    scores = []
+    for finish in get_finishes(len(remaining)):
+        ranks[remaining] = finish
+        scores.append(
+            league.total_performance_scores().values + team_values @ lookup[ranks]
+        )
+    scores = np.array(scores)
+
+    bounds = score_bounds(league, remaining_episodes=0)
+    assert np.array_equal(bounds["min_score"].values, scores.min(axis=0))
+    assert np.array_equal(bounds["max_score"].values, scores.max(axis=0))
+    can_win = (scores == scores.max(axis=1, keepdims=True)).any(axis=0)
+    assert not (bounds["eliminated"].values & can_win).any()
+
+
+def test_bounds_hold_the_final_scores():
+    final_scores = make_league(len(EPISODES)).total_scores()["total_score"].values
+    for n_episodes in range(len(EPISODES)):
+        bounds = score_bounds(make_league(n_episodes), len(EPISODES) - n_episodes)
+        assert (bounds["min_score"].values <= final_scores).all()
+        assert (final_scores <= bounds["max_score"].values).all()
+        assert not bounds["eliminated"].values[final_scores == final_scores.max()].any()
+
+
+def test_contestants_are_eliminated_before_the_finale():
+    # With only the finale left, most of the league can no longer catch the leader
+    bounds = score_bounds(make_league(len(EPISODES) - 1), 1)
+    assert bounds["eliminated"].sum() >= 10
+    # With two episodes left, some already can't
+    assert score_bounds(make_league(len(EPISODES) - 2), 2)["eliminated"].any()
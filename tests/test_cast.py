@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+
+from commish.league import League
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_league():
+    """A season 17 league with no episodes added."""
+    return League(
+        season=17,
+        queens_file=os.path.join(REPO_DIR, "assets/seasons/17/queens.txt"),
+        contestant_file=os.path.join(REPO_DIR, "assets/seasons/17/contestants.tsv"),
+        rank_score_file=os.path.join(
+            REPO_DIR, "assets/rules/rank_values/final_four.tsv"
+        ),
+        event_scores_file=os.path.join(REPO_DIR, "assets/rules/event_scores/small.tsv"),
+    )
+
+
+def test_ranks_stay_unique_after_a_return():
+    league = make_league()
+    cast = league.cast
+    n_queens = len(cast.get_queen_names())
+
+    # Eliminate four queens one at a time, then bring back the first one
+    for week, queen_id in enumerate([0, 1, 2, 3], start=1):
+        league._eliminate_queens([queen_id], week)
+    np.testing.assert_array_equal(
+        cast.rank[[0, 1, 2, 3]], [n_queens, n_queens - 1, n_queens - 2, n_queens - 3]
+    )
+    league._update_returning_queens([0])
+
+    # The queens who went home after her move down to make room
+    assert cast.rank[0] == 0
+    np.testing.assert_array_equal(
+        cast.rank[[1, 2, 3]], [n_queens, n_queens - 1, n_queens - 2]
+    )
+
+    # The next elimination takes the next free rank instead of one that is already taken
+    league._eliminate_queens([4], 5)
+    eliminated_ranks = cast.rank[cast.eliminated]
+    assert len(np.unique(eliminated_ranks)) == len(eliminated_ranks)
+    assert sorted(eliminated_ranks) == list(range(n_queens - 3, n_queens + 1))
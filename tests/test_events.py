@@ -0,0 +1,25 @@
+import numpy as np
+
+from commish.events import EventLog
+
+
+def make_log():
+    log = EventLog()
+    log.append(1, [0, 1, 2], ["tops", "bottoms", "tops"])
+    return log
+
+
+def test_append_to_memory_mapped_log(tmp_path):
+    make_log().export(tmp_path)
+    log = EventLog.load(str(tmp_path), mmap_mode="r")
+
+    # An episode with no scored events
+    log.append(2, [], [])
+    assert len(log) == 3
+
+    log.append(3, [1], ["win_main_challenge"])
+    assert log.get_weeks().tolist() == [1, 1, 1, 3]
+    assert log.get_queen_ids().tolist() == [0, 1, 2, 1]
+    assert log.get_event_names() == ["tops", "bottoms", "win_main_challenge"]
+    # The exported files are left as they were
+    assert len(np.load(tmp_path / "week.npy")) == 3
@@ -0,0 +1,109 @@
+import os
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from commish.league import League
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEASON_DIR = os.path.join(REPO_DIR, "assets/seasons/18")
+
+
+def make_league():
+    """A season 18 league with no episodes added."""
+    return League(
+        season=18,
+        queens_file=os.path.join(SEASON_DIR, "queens.txt"),
+        contestant_file=os.path.join(SEASON_DIR, "contestants.tsv"),
+        rank_score_file=os.path.join(
+            REPO_DIR, "assets/rules/rank_values/final_four.tsv"
+        ),
+        event_scores_file=os.path.join(REPO_DIR, "assets/rules/event_scores/small.tsv"),
+    )
+
+
+def copy_episodes(tmp_path, numbers):
+    """Copy some of the season's episode files to a temporary directory, returning their new paths."""
+    paths = []
+    for n in numbers:
+        path = os.path.join(tmp_path, f"{n:02d}.json")
+        shutil.copy(os.path.join(SEASON_DIR, "episodes", f"{n:02d}.json"), path)
+        paths.append(path)
+    return paths
+
+
+def edit_episode(path, **changes):
+    with open(path, "r") as f:
+        episode = json.load(f)
+    episode.update(changes)
+    with open(path, "w") as f:
+        json.dump(episode, f)
+
+
+def test_failed_batch_leaves_league_unchanged(tmp_path):
+    paths = copy_episodes(tmp_path, [1, 2, 3, 4])
+    # Two returning queens pass the checks when the files are read, but can't be applied
+    queens = make_league().cast.get_queen_names()
+    edit_episode(paths[3], returning_queen=[queens[0], queens[1]])
+
+    league = make_league()
+    league.add_episodes(paths[:2])
+    before_scores = league.total_scores()
+    before_weekly = league.get_weekly_scores()
+    before_ranks = league.cast.get_ranks()
+    before_events = league.cast.get_events().to_frame(queens)
+    before_hashes = list(league.episode_hashes)
+
+    with pytest.raises(AssertionError):
+        league.add_episodes(paths[2:])
+
+    assert league.episode_number == 2
+    assert league.episode_hashes == before_hashes
+    assert league.cast.num_remaining_queens() == (before_ranks == 0).sum()
+    pd.testing.assert_frame_equal(league.total_scores(), before_scores)
+    pd.testing.assert_frame_equal(league.get_weekly_scores(), before_weekly)
+    pd.testing.assert_series_equal(league.cast.get_ranks(), before_ranks)
+    pd.testing.assert_frame_equal(
+        league.cast.get_events().to_frame(queens), before_events
+    )
+
+    # The league still works after the failed batch
+    edit_episode(paths[3], returning_queen=[])
+    league.add_episodes(paths[2:])
+    reference = make_league()
+    os.makedirs(tmp_path / "reference")
+    reference.add_episodes(copy_episodes(tmp_path / "reference", [1, 2, 3, 4]))
+    pd.testing.assert_frame_equal(league.total_scores(), reference.total_scores())
+    np.testing.assert_array_equal(league.cast.rank, reference.cast.rank)
+
+
+def test_errors_are_listed_in_file_order(tmp_path):
+    paths = copy_episodes(tmp_path, [1, 2, 3, 4, 5, 6])
+    edit_episode(paths[2], episode=7)
+    edit_episode(paths[4], queen_eliminated=["Nobody"])
+    os.remove(paths[5])
+    with open(paths[5], "w") as f:
+        f.write("{")
+
+    with pytest.raises(ValueError) as error:
+        make_league().add_episodes(paths)
+    listed = [line.split(": ")[0] for line in str(error.value).splitlines()[1:]]
+    assert listed == [paths[2], paths[4], paths[5]]
+
+
+def test_errors_follow_episode_order_not_file_names(tmp_path):
+    paths = []
+    for n, path in enumerate(copy_episodes(tmp_path, range(1, 11)), start=1):
+        # Without zero padding, 10.json sorts before 2.json
+        paths.append(os.path.join(tmp_path, f"{n}.json"))
+        os.rename(path, paths[-1])
+    edit_episode(paths[1], queen_eliminated=["Nobody"])
+    edit_episode(paths[9], queen_eliminated=["Nobody"])
+
+    with pytest.raises(ValueError) as error:
+        make_league().add_episodes(paths)
+    listed = [line.split(": ")[0] for line in str(error.value).splitlines()[1:]]
+    assert listed == [paths[1], paths[9]]
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from commish.markdown import format_table
+
+
+def test_numbers_and_strings_match_to_markdown():
+    # `to_markdown` needs tabulate, which is only installed with the "test" extra
+    pytest.importorskip("tabulate")
+    frame = pd.DataFrame(
+        {
+            "Name": ["Sasha", "Kim", "Nymphia Wind"],
+            "Score": [12, -3, 150],
+            "Odds": [0.5, 0.125, 1.0],
+            "Mixed": np.array([1, 2.5, 3], dtype=object),
+        },
+        index=pd.Index(["a", "b", "c"], name="Team"),
+    )
+    assert format_table(frame) == frame.to_markdown()
+    assert format_table(frame["Score"]) == frame["Score"].to_markdown()
+
+
+def test_numeric_strings_and_bools_are_not_numbers():
+    frame = pd.DataFrame({"Week": ["1", "2.50"], "Finished": [True, False]})
+    assert format_table(frame) == "\n".join(
+        [
+            "|    | Week   | Finished   |",
+            "|---:|:-------|:-----------|",
+            "|  0 | 1      | True       |",
+            "|  1 | 2.50   | False      |",
+        ]
+    )
+    # tabulate reads these strings as numbers, and a frame of only booleans as 1 and 0
+    assert format_table(frame["Finished"]) == "\n".join(
+        [
+            "|    | Finished   |",
+            "|---:|:-----------|",
+            "|  0 | True       |",
+            "|  1 | False      |",
+        ]
+    )
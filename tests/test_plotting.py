@@ -0,0 +1,29 @@
+import os
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from commish import plotting  # noqa: E402
+
+SCORES = pd.DataFrame(
+    {"total_score": [30, -5, 12]}, index=pd.Index(["Brie", "Kim", "Olivia"])
+)
+
+
+def test_figures_are_registered_with_pyplot_outside_the_build():
+    fig = plotting.draw_total_scores(SCORES)
+    assert plt.gcf() is fig
+    plt.close(fig)
+
+
+def test_pooled_figures_are_reused(tmp_path):
+    with plotting.use_figure_pool():
+        fig = plotting.draw_total_scores(SCORES)
+        # Not managed by pyplot
+        assert fig.canvas.manager is None
+        plotting.save_figure(fig, os.path.join(tmp_path, "a.png"))
+        assert plotting.draw_total_scores(SCORES) is fig
+        plotting.release_figure(fig)
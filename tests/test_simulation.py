@@ -0,0 +1,66 @@
+import os
+from glob import glob
+
+import numpy as np
+
+from commish.league import League
+from commish.simulation import _sample_finishes, simulate_season
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEASON_DIR = os.path.join(REPO_DIR, "assets/seasons/18")
+EPISODES = sorted(glob(os.path.join(SEASON_DIR, "episodes", "*.json")))
+
+
+def make_league(n_episodes):
+    """A season 18 league with its first `n_episodes` episodes added."""
+    league = League(
+        season=18,
+        queens_file=os.path.join(SEASON_DIR, "queens.txt"),
+        contestant_file=os.path.join(SEASON_DIR, "contestants.tsv"),
+        rank_score_file=os.path.join(
+            REPO_DIR, "assets/rules/rank_values/final_three.tsv"
+        ),
+        event_scores_file=os.path.join(REPO_DIR, "assets/rules/event_scores/large.tsv"),
+    )
+    league.add_episodes(EPISODES[:n_episodes])
+    return league
+
+
+def test_finished_season_gives_the_final_scores():
+    league = make_league(len(EPISODES))
+    odds = simulate_season(league, n_sims=10, seed=0, remaining_episodes=0)
+    final = league.total_scores()["total_score"].reindex(odds.index)
+    assert np.allclose(odds["expected_score"], final)
+
+
+def test_expected_scores_include_future_performance():
+    final = make_league(len(EPISODES)).total_scores()["total_score"]
+    for n_episodes in [4, 8]:
+        league = make_league(n_episodes)
+        odds = simulate_season(
+            league, n_sims=2000, seed=0, remaining_episodes=16 - n_episodes
+        )
+        ratio = (odds["expected_score"] / final.reindex(odds.index)).mean()
+        assert 0.9 < ratio < 1.1, (n_episodes, ratio)
+        assert np.isclose(odds["p_first"].sum(), 1, atol=0.02)
+
+
+def test_results_do_not_depend_on_jobs():
+    league = make_league(8)
+    odds = simulate_season(
+        league, n_sims=200, seed=1, batch_size=50, remaining_episodes=8
+    )
+    odds_parallel = simulate_season(
+        league, n_sims=200, seed=1, batch_size=50, remaining_episodes=8, jobs=2
+    )
+    assert odds.equals(odds_parallel)
+
+
+def test_finishes_share_ranks():
+    rng = np.random.default_rng(0)
+    ranks, blocks, n_blocks = _sample_finishes(rng, np.zeros(8), 3, 1.0, 100)
+    for row, row_blocks, n in zip(ranks, blocks, n_blocks):
+        assert sorted(row[row_blocks < 0]) == [1, 2, 2]
+        # With every elimination a double one, the other five queens go home in two pairs, sharing the higher place, and then alone
+        assert sorted(row[row_blocks >= 0]) == [4, 5, 5, 7, 7]
+        assert n == 3